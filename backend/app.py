@@ -5,6 +5,9 @@ from config import settings
 # Import routes modules
 from routes import properties_improved as properties
 from routes import osm_data as osm  # Import the new OSM data router
+from routes import search
+from models.database import async_engine, get_pool_status
+from utils.http_client import init_http_client, close_http_client
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -21,6 +24,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[search.NEXT_CURSOR_HEADER],  # Cursor of the next /search page
 )
 
 # Root endpoint
@@ -32,21 +36,39 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db-pool")
+async def db_pool_status():
+    # Connection pool occupancy and checkout latency for sizing/starvation checks
+    return get_pool_status()
+
 # Initialize routers
 app.include_router(properties.router, prefix=settings.API_V1_PREFIX)
 app.include_router(osm.router, prefix=settings.API_V1_PREFIX)  # Add OSM router
+app.include_router(search.router, prefix=settings.API_V1_PREFIX)  # Database searches (nearby, by address, college distance)
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
+    # Create the shared HTTP client used for OSM lookups
+    await init_http_client()
+    
+    # Restore persisted OSM results, if configured
+    osm.load_overpass_cache()
+    
     # Print startup message
     print("Server started successfully")
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
-    # Close connections (will be implemented later)
-    pass
+    # Close pooled outbound HTTP connections
+    await close_http_client()
+    
+    # Persist cached OSM results for the next start
+    osm.save_overpass_cache()
+    
+    # Close pooled database connections
+    await async_engine.dispose()
 
 if __name__ == "__main__":
     import uvicorn
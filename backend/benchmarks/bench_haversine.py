@@ -0,0 +1,79 @@
+"""
+Microbenchmark: scalar haversine loop vs. the vectorized kernels in utils.geo
+
+Times a radius search over N random points (the old per-record loop, the vectorized
+kernel, and the kernel with bounding-box prefiltering) and a properties x colleges
+distance matrix.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_haversine --points 100000 --colleges 200 --radius-km 5
+"""
+import argparse
+import random
+import timeit
+
+from utils.geo import haversine_km, haversine_km_many, pairwise_haversine_km, within_radius
+
+# Random points around Delhi NCR, roughly the spread of the listings
+CENTER_LATITUDE, CENTER_LONGITUDE, SPREAD_DEG = 28.6, 77.2, 1.0
+
+
+def random_points(count: int):
+    latitudes = [CENTER_LATITUDE + random.uniform(-SPREAD_DEG, SPREAD_DEG) for _ in range(count)]
+    longitudes = [CENTER_LONGITUDE + random.uniform(-SPREAD_DEG, SPREAD_DEG) for _ in range(count)]
+    return latitudes, longitudes
+
+
+def best_ms(statement, repeat: int) -> float:
+    return min(timeit.repeat(statement, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare scalar and vectorized haversine")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--colleges", type=int, default=200)
+    parser.add_argument("--radius-km", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    random.seed(0)
+    latitudes, longitudes = random_points(args.points)
+    college_latitudes, college_longitudes = random_points(args.colleges)
+    
+    def scalar_radius():
+        return [
+            i for i, (lat, lon) in enumerate(zip(latitudes, longitudes))
+            if haversine_km(CENTER_LATITUDE, CENTER_LONGITUDE, lat, lon) <= args.radius_km
+        ]
+    
+    def vector_radius():
+        return (haversine_km_many(CENTER_LATITUDE, CENTER_LONGITUDE, latitudes, longitudes) <= args.radius_km).nonzero()[0]
+    
+    def bbox_radius():
+        return within_radius(CENTER_LATITUDE, CENTER_LONGITUDE, args.radius_km, latitudes, longitudes)[0]
+    
+    assert sorted(scalar_radius()) == sorted(bbox_radius().tolist())
+    
+    print(f"Radius search over {args.points} points ({args.radius_km} km)")
+    for label, statement in (("scalar loop", scalar_radius), ("vectorized", vector_radius), ("vectorized + bbox", bbox_radius)):
+        print(f"  {label:<20} {best_ms(statement, args.repeat):10.2f} ms")
+    
+    # Many-to-many on a slice so the scalar baseline finishes in reasonable time
+    rows = min(args.points, 10_000)
+    
+    def scalar_matrix():
+        return [
+            [haversine_km(lat, lon, c_lat, c_lon) for c_lat, c_lon in zip(college_latitudes, college_longitudes)]
+            for lat, lon in zip(latitudes[:rows], longitudes[:rows])
+        ]
+    
+    def vector_matrix():
+        return pairwise_haversine_km(latitudes[:rows], longitudes[:rows], college_latitudes, college_longitudes)
+    
+    print(f"Distance matrix {rows} properties x {args.colleges} colleges")
+    for label, statement in (("scalar loop", scalar_matrix), ("vectorized", vector_matrix)):
+        print(f"  {label:<20} {best_ms(statement, args.repeat):10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Microbenchmark: per-row cost of serializing property search results
+
+Compares the previous path (ORM instance -> dict over every table column -> WKB decode
+for lat/lon -> Pydantic validation -> JSON) with the column-projection path (row tuple
+-> orjson bytes) used by routes/search.py. No database is needed; rows are synthesized.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 20
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from geoalchemy2.shape import from_shape
+from pydantic import TypeAdapter
+from shapely.geometry import Point
+
+from models.property import Property, PropertyType
+from routes.search import LocationSearchResponse, RESPONSE_KEYS
+from utils.amenities import AMENITY_FIELDS
+from utils.serialization import rows_response
+
+
+def sample_values(index: int) -> dict:
+    return {
+        "id": index,
+        "title": f"PG near campus #{index}",
+        "description": "Fully furnished rooms with meals",
+        "property_type": PropertyType.PG,
+        "address": f"{index}, Delhi-Meerut Road",
+        "city": "Ghaziabad",
+        "state": "Uttar Pradesh",
+        "zipcode": "201206",
+        "price": 8500.0 + index,
+        "price_type": "monthly",
+        **{field: field in ("has_wifi", "has_mess") for field in AMENITY_FIELDS},
+        "owner_id": 1,
+        "is_available": True,
+        "is_verified": True,
+        "rating_sum": 9.0,
+        "rating_count": 2,
+        "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+    }
+
+
+def orm_rows(count: int):
+    rows = []
+    for index in range(count):
+        values = sample_values(index)
+        # The response schema declares created_at as str
+        values["created_at"] = values["created_at"].isoformat()
+        prop = Property(**values, location=from_shape(Point(77.49, 28.75), srid=4326))
+        rows.append((prop, 1234.5))
+    return rows
+
+
+def tuple_rows(count: int):
+    rows = []
+    for index in range(count):
+        values = {**sample_values(index), "latitude": 28.75, "longitude": 77.49, "average_rating": 4.5}
+        rows.append(tuple(values.get(key) for key in RESPONSE_KEYS[:-1]) + (1.2345,))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ORM/Pydantic and projection serialization")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    adapter = TypeAdapter(List[LocationSearchResponse])
+    orm = orm_rows(args.rows)
+    tuples = tuple_rows(args.rows)
+    
+    def before() -> bytes:
+        properties = []
+        for property_obj, distance_meters in orm:
+            properties.append({
+                **{c.name: getattr(property_obj, c.name) for c in property_obj.__table__.columns},
+                "latitude": property_obj.latitude,
+                "longitude": property_obj.longitude,
+                "average_rating": property_obj.average_rating,
+                "distance_km": distance_meters / 1000
+            })
+        # What FastAPI does with a response_model: validate, encode, json.dumps
+        validated = adapter.validate_python(properties)
+        return json.dumps(jsonable_encoder(validated)).encode()
+    
+    def after() -> bytes:
+        return rows_response(RESPONSE_KEYS, tuples).body
+    
+    for label, statement in (("ORM + Pydantic", before), ("projection + orjson", after)):
+        seconds = min(timeit.repeat(statement, number=1, repeat=args.repeat))
+        print(f"{label:<22} {seconds * 1000:9.2f} ms total  {seconds / args.rows * 1e6:8.2f} us/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compare query plans of the nearby search with and without the property indexes
+
+Runs EXPLAIN (ANALYZE, BUFFERS) on the query shape built by /search/nearby twice inside a
+rolled-back transaction: first with index scans disabled for the planner (the plan the
+table had before the spatial/partial indexes), then with the planner defaults.
+
+Usage (from the backend directory, against a populated database):
+    python -m benchmarks.explain_nearby --latitude 28.6139 --longitude 77.2090 --radius-km 5 \
+        --property-type pg --max-price 10000 --room-type double --gender male
+"""
+import argparse
+import logging
+import re
+
+from sqlalchemy import func, select
+
+from models.database import engine
+from models.property import Property, PropertyType, RoomType, GenderPreference, make_geography_point
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Planner switches that force the pre-index plan (sequential scan + sort)
+DISABLE_INDEX_SETTINGS = ("enable_indexscan", "enable_bitmapscan", "enable_indexonlyscan")
+
+
+def build_nearby_query(args):
+    """Mirror the filter combination and ordering of search_nearby_properties"""
+    point = make_geography_point(args.latitude, args.longitude)
+    knn_distance = Property.location.op("<->")(point)
+    
+    query = (
+        select(Property.id, func.ST_Distance(Property.location, point).label("distance_meters"))
+        .filter(func.ST_DWithin(Property.location, point, args.radius_km * 1000))
+        .filter(Property.is_available == True)
+    )
+    if args.property_type:
+        query = query.filter(Property.property_type == PropertyType(args.property_type))
+    if args.max_price is not None:
+        query = query.filter(Property.price <= args.max_price)
+    if args.room_type:
+        query = query.filter(Property.room_type == RoomType(args.room_type))
+    if args.gender:
+        query = query.filter(Property.gender == GenderPreference(args.gender))
+    if args.max_college_distance is not None:
+        query = query.filter(Property.college_distance_km <= args.max_college_distance)
+    
+    return query.order_by(knn_distance, Property.id).limit(args.limit)
+
+
+def explain(connection, sql: str, disable_indexes: bool) -> str:
+    """Run EXPLAIN ANALYZE in a transaction that is rolled back afterwards"""
+    transaction = connection.begin()
+    try:
+        if disable_indexes:
+            for setting in DISABLE_INDEX_SETTINGS:
+                connection.exec_driver_sql(f"SET LOCAL {setting} = off")
+        rows = connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {sql}").all()
+        return "\n".join(row[0] for row in rows)
+    finally:
+        transaction.rollback()
+
+
+def execution_time_ms(plan: str) -> float:
+    """Extract the 'Execution Time' reported by EXPLAIN ANALYZE"""
+    match = re.search(r"Execution Time: ([\d.]+) ms", plan)
+    return float(match.group(1)) if match else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the nearby search with and without indexes")
+    parser.add_argument("--latitude", type=float, required=True)
+    parser.add_argument("--longitude", type=float, required=True)
+    parser.add_argument("--radius-km", type=float, default=5.0)
+    parser.add_argument("--property-type", choices=[t.value for t in PropertyType])
+    parser.add_argument("--max-price", type=float)
+    parser.add_argument("--room-type", choices=[t.value for t in RoomType])
+    parser.add_argument("--gender", choices=[g.value for g in GenderPreference])
+    parser.add_argument("--max-college-distance", type=float)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    
+    with engine.connect() as connection:
+        sql = str(build_nearby_query(args).compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+        
+        # Warm the cache once so both runs read from shared buffers
+        explain(connection, sql, disable_indexes=False)
+        
+        timings = {}
+        for label, disable_indexes in (("without indexes", True), ("with indexes", False)):
+            plan = explain(connection, sql, disable_indexes)
+            timings[label] = execution_time_ms(plan)
+            print(f"=== {label} ===\n{plan}\n")
+    
+    for label, elapsed in timings.items():
+        logger.info(f"{label}: {elapsed:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
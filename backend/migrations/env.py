@@ -8,6 +8,9 @@ from alembic import context
 # Import our models to ensure they're known to SQLAlchemy
 import models.property
 import models.user
+import models.review
+import models.osm_accommodation
+import models.college
 from models.database import Base
 from config import settings
 
@@ -0,0 +1,46 @@
+"""Add osm_accommodations table for locally imported OSM extracts
+
+Revision ID: 02_add_osm_accommodations
+Revises: 01_add_student_focused_fields
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '02_add_osm_accommodations'
+down_revision: Union[str, None] = '01_add_student_focused_fields'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    
+    op.create_table(
+        'osm_accommodations',
+        sa.Column('osm_type', sa.String(10), nullable=False),
+        sa.Column('osm_id', sa.BigInteger(), nullable=False),
+        sa.Column('name', sa.String(255), nullable=True),
+        sa.Column('acc_type', sa.String(50), nullable=False),
+        sa.Column('accommodation_types', postgresql.ARRAY(sa.String(50)), nullable=False),
+        sa.Column('tags', postgresql.JSONB(), nullable=False, server_default='{}'),
+        sa.Column('location', geoalchemy2.Geography('POINT', srid=4326, spatial_index=False), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('osm_type', 'osm_id'),
+    )
+    
+    # GiST index for radius/KNN search and GIN index for type filtering
+    op.create_index('ix_osm_accommodations_location', 'osm_accommodations', ['location'], postgresql_using='gist')
+    op.create_index('ix_osm_accommodations_types', 'osm_accommodations', ['accommodation_types'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_osm_accommodations_types', table_name='osm_accommodations')
+    op.drop_index('ix_osm_accommodations_location', table_name='osm_accommodations')
+    op.drop_table('osm_accommodations')
@@ -0,0 +1,31 @@
+"""Add osm_replication_state table for incremental OSM diff updates
+
+Revision ID: 03_add_osm_replication_state
+Revises: 02_add_osm_accommodations
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '03_add_osm_replication_state'
+down_revision: Union[str, None] = '02_add_osm_accommodations'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'osm_replication_state',
+        sa.Column('table_name', sa.String(100), nullable=False),
+        sa.Column('sequence_number', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('osm_replication_state')
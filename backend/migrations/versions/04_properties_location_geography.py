@@ -0,0 +1,37 @@
+"""Store properties.location as geography with a GiST index
+
+Revision ID: 04_properties_location_geography
+Revises: 03_add_osm_replication_state
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '04_properties_location_geography'
+down_revision: Union[str, None] = '03_add_osm_replication_state'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Index created by geoalchemy2 for the old geometry column, if any
+    op.execute("DROP INDEX IF EXISTS idx_properties_location")
+    
+    # Geography makes ST_DWithin/ST_Distance work in meters instead of degrees
+    op.execute(
+        "ALTER TABLE properties ALTER COLUMN location "
+        "TYPE geography(POINT, 4326) USING location::geography"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_properties_location ON properties USING gist (location)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_properties_location")
+    op.execute(
+        "ALTER TABLE properties ALTER COLUMN location "
+        "TYPE geometry(POINT, 4326) USING location::geometry"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_properties_location ON properties USING gist (location)")
@@ -0,0 +1,39 @@
+"""Add rating_sum/rating_count aggregates to properties
+
+Revision ID: 05_add_property_rating_aggregates
+Revises: 04_properties_location_geography
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '05_add_property_rating_aggregates'
+down_revision: Union[str, None] = '04_properties_location_geography'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('properties', sa.Column('rating_sum', sa.Float(), server_default='0', nullable=False))
+    op.add_column('properties', sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+    
+    # Backfill from existing reviews
+    op.execute("""
+        UPDATE properties p
+        SET rating_sum = r.rating_sum, rating_count = r.rating_count
+        FROM (
+            SELECT property_id, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+            FROM reviews
+            GROUP BY property_id
+        ) r
+        WHERE r.property_id = p.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('properties', 'rating_count')
+    op.drop_column('properties', 'rating_sum')
@@ -0,0 +1,34 @@
+"""Add pg_trgm indexes for address/city search
+
+Revision ID: 06_add_address_trigram_indexes
+Revises: 05_add_property_rating_aggregates
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '06_add_address_trigram_indexes'
+down_revision: Union[str, None] = '05_add_property_rating_aggregates'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ADDRESS_SEARCH_COLUMNS = ('address', 'city', 'state', 'zipcode')
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    # GIN trigram indexes let ILIKE '%x%' and similarity() use bitmap index scans
+    for column in ADDRESS_SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_properties_{column}_trgm', 'properties', [column],
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    for column in ADDRESS_SEARCH_COLUMNS:
+        op.drop_index(f'ix_properties_{column}_trgm', table_name='properties')
@@ -0,0 +1,52 @@
+"""Add partial spatial and filter indexes for available properties
+
+Revision ID: 07_add_property_filter_indexes
+Revises: 06_add_address_trigram_indexes
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '07_add_property_filter_indexes'
+down_revision: Union[str, None] = '06_add_address_trigram_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GET /properties/nearby and the /search routes all filter is_available = true, so the
+# indexes skip unlisted rows
+AVAILABLE_PREDICATE = sa.text('is_available = true')
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_properties_available_location', 'properties', ['location'],
+        postgresql_using='gist', postgresql_where=AVAILABLE_PREDICATE
+    )
+    op.create_index(
+        'ix_properties_available_type_price', 'properties', ['property_type', 'price'],
+        postgresql_where=AVAILABLE_PREDICATE
+    )
+    op.create_index(
+        'ix_properties_available_room_gender', 'properties', ['room_type', 'gender'],
+        postgresql_where=AVAILABLE_PREDICATE
+    )
+    op.create_index(
+        'ix_properties_available_food_facility', 'properties', ['food_facility'],
+        postgresql_where=AVAILABLE_PREDICATE
+    )
+    op.create_index(
+        'ix_properties_available_college_distance', 'properties', ['college_distance_km'],
+        postgresql_where=AVAILABLE_PREDICATE
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_properties_available_college_distance', table_name='properties')
+    op.drop_index('ix_properties_available_food_facility', table_name='properties')
+    op.drop_index('ix_properties_available_room_gender', table_name='properties')
+    op.drop_index('ix_properties_available_type_price', table_name='properties')
+    op.drop_index('ix_properties_available_location', table_name='properties')
@@ -0,0 +1,37 @@
+"""Add packed amenity_mask to properties
+
+Revision ID: 08_add_property_amenity_mask
+Revises: 07_add_property_filter_indexes
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '08_add_property_amenity_mask'
+down_revision: Union[str, None] = '07_add_property_filter_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Bit order of utils.amenities.AMENITY_FIELDS at the time of this migration
+AMENITY_FIELDS = (
+    'has_wifi', 'has_ac', 'has_parking', 'has_tv', 'has_kitchen', 'has_washing_machine',
+    'has_gym', 'has_study_room', 'has_mess', 'has_laundry', 'has_hot_water',
+)
+
+
+def upgrade() -> None:
+    op.add_column('properties', sa.Column('amenity_mask', sa.Integer(), server_default='0', nullable=False))
+    
+    # Backfill from the existing has_* flags
+    bits = " | ".join(
+        f"(CASE WHEN {field} THEN {1 << bit} ELSE 0 END)" for bit, field in enumerate(AMENITY_FIELDS)
+    )
+    op.execute(f"UPDATE properties SET amenity_mask = {bits}")
+
+
+def downgrade() -> None:
+    op.drop_column('properties', 'amenity_mask')
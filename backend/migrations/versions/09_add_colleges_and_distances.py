@@ -0,0 +1,55 @@
+"""Add colleges and materialized property_college_distances
+
+Revision ID: 09_add_colleges_and_distances
+Revises: 08_add_property_amenity_mask
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+# revision identifiers, used by Alembic.
+revision: str = '09_add_colleges_and_distances'
+down_revision: Union[str, None] = '08_add_property_amenity_mask'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'colleges',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('city', sa.String(length=100), nullable=True),
+        sa.Column('location', geoalchemy2.Geography('POINT', srid=4326, spatial_index=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_index('ix_colleges_id', 'colleges', ['id'])
+    op.create_index('ix_colleges_location', 'colleges', ['location'], postgresql_using='gist')
+    
+    op.create_table(
+        'property_college_distances',
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('college_id', sa.Integer(), nullable=False),
+        sa.Column('distance_km', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['college_id'], ['colleges.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('property_id', 'college_id')
+    )
+    op.create_index(
+        'ix_property_college_distances_college_distance', 'property_college_distances',
+        ['college_id', 'distance_km']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_property_college_distances_college_distance', table_name='property_college_distances')
+    op.drop_table('property_college_distances')
+    op.drop_index('ix_colleges_location', table_name='colleges')
+    op.drop_index('ix_colleges_id', table_name='colleges')
+    op.drop_table('colleges')
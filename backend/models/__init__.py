@@ -1,14 +1,21 @@
-from models.database import Base, get_db, init_db, db_session
+from models.database import Base, get_db, get_async_db, init_db, db_session
 from models.user import User
 from models.property import Property
 from models.review import Review
+from models.osm_accommodation import OsmAccommodation, OsmReplicationState
+from models.college import College, PropertyCollegeDistance
 
 __all__ = [
     "Base", 
     "get_db", 
+    "get_async_db",
     "init_db", 
     "db_session",
     "User",
     "Property",
-    "Review"
+    "Review",
+    "OsmAccommodation",
+    "OsmReplicationState",
+    "College",
+    "PropertyCollegeDistance"
 ]
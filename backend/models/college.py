@@ -0,0 +1,164 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, event, inspect, select, delete, insert, cast
+from sqlalchemy.sql import func
+from geoalchemy2 import Geography, Geometry
+
+from config import settings
+from models.database import Base
+from models.property import Property
+from utils.geo import geohash_encode, within_radius
+
+class College(Base):
+    """
+    College/campus that properties can be searched around
+    """
+    __tablename__ = "colleges"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False, unique=True)
+    city = Column(String(100))
+    location = Column(Geography("POINT", srid=4326, spatial_index=False), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_colleges_location", "location", postgresql_using="gist"),
+    )
+
+class PropertyCollegeDistance(Base):
+    """
+    Materialized property x college distances, only for pairs within
+    COLLEGE_DISTANCE_MAX_KM (filled by scripts/refresh_college_distances.py and kept
+    fresh by the Property and College write listeners below); radii past the cap
+    fall back to ST_DWithin in within_college_distance
+    """
+    __tablename__ = "property_college_distances"
+
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True)
+    college_id = Column(Integer, ForeignKey("colleges.id", ondelete="CASCADE"), primary_key=True)
+    distance_km = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # "within X km of college Y" is a range scan on this index
+        Index("ix_property_college_distances_college_distance", "college_id", "distance_km"),
+    )
+
+
+def point_coordinates(location_column):
+    """(latitude, longitude) SQL expressions for a geography POINT column"""
+    geometry = cast(location_column, Geometry("POINT", srid=4326))
+    return func.ST_Y(geometry), func.ST_X(geometry)
+
+
+def within_college_distance(college_id: int, max_distance_km: float):
+    """
+    SQL condition on Property: within max_distance_km of the given college
+
+    Served from the materialized table when the radius is covered by it, otherwise by a
+    spatial filter against the college location.
+    """
+    if max_distance_km <= settings.COLLEGE_DISTANCE_MAX_KM:
+        distances = PropertyCollegeDistance.__table__
+        return Property.id.in_(
+            select(distances.c.property_id)
+            .where(distances.c.college_id == college_id)
+            .where(distances.c.distance_km <= max_distance_km)
+        )
+    college_location = select(College.location).where(College.id == college_id).scalar_subquery()
+    return func.ST_DWithin(Property.location, college_location, max_distance_km * 1000)
+
+
+def college_at(latitude: float, longitude: float, precision: int = settings.NEARBY_CACHE_GEOHASH_PRECISION):
+    """
+    Query for the id of a college in the same geohash cell as the point, i.e. a search
+    centred on that campus
+    """
+    geometry = cast(College.location, Geometry("POINT", srid=4326))
+    return (
+        select(College.id)
+        .where(func.ST_GeoHash(geometry, precision) == geohash_encode(latitude, longitude, precision))
+        .limit(1)
+    )
+
+
+def iter_college_distance_rows(property_ids, latitudes, longitudes, college_ids, college_latitudes, college_longitudes):
+    """
+    Distance rows for every property/college pair within COLLEGE_DISTANCE_MAX_KM,
+    computed one college at a time with the vectorized haversine kernel
+    """
+    for college_id, college_lat, college_lon in zip(college_ids, college_latitudes, college_longitudes):
+        indices, distances = within_radius(college_lat, college_lon, settings.COLLEGE_DISTANCE_MAX_KM, latitudes, longitudes)
+        for index, distance in zip(indices, distances):
+            yield {"property_id": int(property_ids[index]), "college_id": college_id, "distance_km": float(distance)}
+
+
+def _refresh_property_distances(connection, property_id):
+    """Recompute one property's distance rows in the same transaction"""
+    distances = PropertyCollegeDistance.__table__
+    connection.execute(delete(distances).where(distances.c.property_id == property_id))
+    
+    properties = Property.__table__
+    point = connection.execute(
+        select(*point_coordinates(properties.c.location)).where(properties.c.id == property_id)
+    ).first()
+    if point is None or point[0] is None:
+        return
+    
+    colleges = College.__table__
+    college_rows = connection.execute(select(colleges.c.id, *point_coordinates(colleges.c.location))).all()
+    if not college_rows:
+        return
+    
+    college_ids, college_latitudes, college_longitudes = zip(*college_rows)
+    # One property against all colleges: the kernel runs from the property outwards
+    indices, values = within_radius(point[0], point[1], settings.COLLEGE_DISTANCE_MAX_KM, college_latitudes, college_longitudes)
+    rows = [
+        {"property_id": property_id, "college_id": college_ids[index], "distance_km": float(distance)}
+        for index, distance in zip(indices, values)
+    ]
+    if rows:
+        connection.execute(insert(distances), rows)
+
+def _refresh_college_distances(connection, college_id):
+    """Recompute one college's distance rows in the same transaction"""
+    distances = PropertyCollegeDistance.__table__
+    connection.execute(delete(distances).where(distances.c.college_id == college_id))
+    
+    colleges = College.__table__
+    college = connection.execute(
+        select(*point_coordinates(colleges.c.location)).where(colleges.c.id == college_id)
+    ).first()
+    if college is None or college[0] is None:
+        return
+    college_location = select(colleges.c.location).where(colleges.c.id == college_id).scalar_subquery()
+    
+    # The GiST index narrows properties to the neighbourhood (widened 1% for the
+    # spheroid vs sphere difference); the haversine kernel then decides the cap
+    properties = Property.__table__
+    property_rows = connection.execute(
+        select(properties.c.id, *point_coordinates(properties.c.location))
+        .where(func.ST_DWithin(properties.c.location, college_location, settings.COLLEGE_DISTANCE_MAX_KM * 1010))
+    ).all()
+    if not property_rows:
+        return
+    
+    property_ids, latitudes, longitudes = zip(*property_rows)
+    rows = list(iter_college_distance_rows(property_ids, latitudes, longitudes, [college_id], [college[0]], [college[1]]))
+    if rows:
+        connection.execute(insert(distances), rows)
+
+@event.listens_for(Property, "after_insert")
+def _property_inserted(mapper, connection, target):
+    _refresh_property_distances(connection, target.id)
+
+@event.listens_for(Property, "after_update")
+def _property_updated(mapper, connection, target):
+    if inspect(target).attrs.location.history.has_changes():
+        _refresh_property_distances(connection, target.id)
+
+@event.listens_for(College, "after_insert")
+def _college_inserted(mapper, connection, target):
+    _refresh_college_distances(connection, target.id)
+
+@event.listens_for(College, "after_update")
+def _college_updated(mapper, connection, target):
+    if inspect(target).attrs.location.history.has_changes():
+        _refresh_college_distances(connection, target.id)
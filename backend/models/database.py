@@ -1,15 +1,128 @@
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
 
 from config import settings
 
-# Create SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL)
+def get_async_database_url(url: str) -> str:
+    """
+    Derive the asyncpg URL from DATABASE_URL unless ASYNC_DATABASE_URL is set
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+# Pool options shared by both engines
+POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+# Server-side statement timeout, passed in the driver-specific way
+sync_connect_args = {}
+async_connect_args = {}
+if settings.DB_STATEMENT_TIMEOUT_MS:
+    sync_connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    async_connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+# Create SQLAlchemy engine (sync: scripts, migrations, init_db)
+engine = create_engine(settings.DATABASE_URL, connect_args=sync_connect_args, **POOL_OPTIONS)
+
+# Create async engine used by the API routes
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    connect_args=async_connect_args,
+    **POOL_OPTIONS
+)
+
+class PoolMetrics:
+    """
+    Counters for the API connection pool: checkouts, new connections,
+    invalidations, timeouts and checkout latency per request.
+
+    Checkout latency runs from asking the session for a connection to holding one, so
+    besides queueing on a busy pool it includes opening a new connection and the pre-ping.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.checkout_latencies = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
 
-# Create session factory
+    def record_checkout_latency(self, seconds: float) -> None:
+        with self._lock:
+            self.checkout_latencies += 1
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def attach(self, pool) -> None:
+        """Register pool event listeners that feed the counters"""
+        def count(attr):
+            def listener(*args):
+                with self._lock:
+                    setattr(self, attr, getattr(self, attr) + 1)
+            return listener
+        event.listen(pool, "checkout", count("checkouts"))
+        event.listen(pool, "checkin", count("checkins"))
+        event.listen(pool, "connect", count("connects"))
+        event.listen(pool, "invalidate", count("invalidations"))
+
+    def snapshot(self, pool) -> dict:
+        """Current pool occupancy plus the accumulated counters"""
+        with self._lock:
+            return {
+                "pool_size": pool.size(),
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # Negative while the pool has not yet opened pool_size connections
+                "overflow": pool.overflow(),
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "checkout_latency_count": self.checkout_latencies,
+                "checkout_latency_seconds_avg": (
+                    round(self.checkout_seconds_total / self.checkout_latencies, 6) if self.checkout_latencies else None
+                ),
+                "checkout_latency_seconds_max": round(self.checkout_seconds_max, 6),
+            }
+
+pool_metrics = PoolMetrics()
+pool_metrics.attach(async_engine.sync_engine.pool)
+
+def get_pool_status() -> dict:
+    """
+    Report connection pool health for the API engine
+    """
+    return pool_metrics.snapshot(async_engine.sync_engine.pool)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Create base class for models
 Base = declarative_base()
@@ -25,6 +138,28 @@ def get_db():
     finally:
         db.close()
 
+# Async database dependency
+async def get_async_db():
+    """
+    Dependency for getting an async database session
+    """
+    async with AsyncSessionLocal() as db:
+        # Acquire the connection up front so checkout latency (pool queueing plus any new
+        # connection and pre-ping) is measured.
+        started = time.perf_counter()
+        try:
+            await db.connection()
+            pool_metrics.record_checkout_latency(time.perf_counter() - started)
+        except PoolTimeoutError:
+            # Fail the request now; letting the route retry would wait pool_timeout again
+            pool_metrics.record_timeout()
+            raise
+        except (OSError, DBAPIError) as e:
+            # Database unreachable (refused, DNS, auth): routes with a mock-data fallback
+            # hit the same error on their first query and serve the fallback
+            print(f"Database connection failed: {e}")
+        yield db
+
 # Initialize database
 def init_db():
     """
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, BigInteger, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.sql import func
+from geoalchemy2 import Geography
+
+from models.database import Base
+
+class OsmAccommodation(Base):
+    """
+    Accommodation imported from a local OpenStreetMap extract, used to serve
+    /osm/search without calling the public Overpass API
+    """
+    __tablename__ = "osm_accommodations"
+
+    # OSM element identity ("node", "way" or "relation" plus its OSM id)
+    osm_type = Column(String(10), primary_key=True)
+    osm_id = Column(BigInteger, primary_key=True)
+    
+    name = Column(String(255))
+    acc_type = Column(String(50), nullable=False)  # Result type shown to users (hostel, hotel, ...)
+    accommodation_types = Column(ARRAY(String(50)), nullable=False)  # Search types from TAG_MAPPING
+    tags = Column(JSONB, nullable=False, default=dict)
+    
+    # Node position or way/relation bounding-box center, as geography so distances are in meters
+    location = Column(Geography("POINT", srid=4326, spatial_index=False), nullable=False)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_osm_accommodations_location", "location", postgresql_using="gist"),
+        Index("ix_osm_accommodations_types", "accommodation_types", postgresql_using="gin"),
+    )
+
+class OsmReplicationState(Base):
+    """
+    Last OSM replication sequence applied to a locally imported table
+    """
+    __tablename__ = "osm_replication_state"
+
+    table_name = Column(String(100), primary_key=True)
+    sequence_number = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum, Index, cast, text, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from geoalchemy2 import Geometry
+from geoalchemy2 import Geography
+from geoalchemy2.shape import to_shape
 import enum
 
 from models.database import Base
+from utils.amenities import amenity_mask as pack_amenities
 
 class PropertyType(str, enum.Enum):
     PG = "pg"
@@ -32,6 +34,18 @@ class FoodFacility(str, enum.Enum):
     MEALS_PLAN = "mealsPlan"
     KITCHEN = "kitchen"
 
+# Text columns matched by address search, each with a trigram index
+ADDRESS_SEARCH_COLUMNS = ("address", "city", "state", "zipcode")
+
+# Predicate of the partial indexes; queries must filter `is_available = true` to use them
+AVAILABLE_PREDICATE = text("is_available = true")
+
+def make_geography_point(latitude: float, longitude: float):
+    """
+    Build a geography POINT expression so PostGIS distance functions work in meters
+    """
+    return cast(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326), Geography("POINT", srid=4326))
+
 class Property(Base):
     __tablename__ = "properties"
 
@@ -44,8 +58,8 @@ class Property(Base):
     state = Column(String(100))
     zipcode = Column(String(20))
     
-    # Location coordinates stored as PostGIS POINT geometry
-    location = Column(Geometry("POINT", srid=4326), nullable=False)
+    # Location stored as PostGIS geography POINT (distances and radii in meters)
+    location = Column(Geography("POINT", srid=4326, spatial_index=False), nullable=False)
     
     # Property details
     price = Column(Float, nullable=False)
@@ -75,6 +89,8 @@ class Property(Base):
     has_mess = Column(Boolean, default=False)
     has_laundry = Column(Boolean, default=False)
     has_hot_water = Column(Boolean, default=False)
+    # The has_* flags packed by utils.amenities (kept in sync by the write listeners below)
+    amenity_mask = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Contact information
     contact_name = Column(String(100))
@@ -91,6 +107,11 @@ class Property(Base):
     is_available = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     
+    # Review aggregates, maintained by the Review write listeners in models/review.py
+    # so average_rating never has to load the reviews collection
+    rating_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -99,27 +120,47 @@ class Property(Base):
     owner = relationship("User", back_populates="properties")
     reviews = relationship("Review", back_populates="property", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # GiST index used by ST_DWithin radius filters and <-> KNN ordering
+        Index("ix_properties_location", "location", postgresql_using="gist"),
+        # Trigram indexes (pg_trgm) serving ILIKE '%...%' and similarity() in address search
+        *(
+            Index(f"ix_properties_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+            for column in ADDRESS_SEARCH_COLUMNS
+        ),
+        # Partial indexes over listed properties only, matching the nearby/search filters
+        Index("ix_properties_available_location", "location", postgresql_using="gist", postgresql_where=AVAILABLE_PREDICATE),
+        Index("ix_properties_available_type_price", "property_type", "price", postgresql_where=AVAILABLE_PREDICATE),
+        Index("ix_properties_available_room_gender", "room_type", "gender", postgresql_where=AVAILABLE_PREDICATE),
+        Index("ix_properties_available_food_facility", "food_facility", postgresql_where=AVAILABLE_PREDICATE),
+        Index("ix_properties_available_college_distance", "college_distance_km", postgresql_where=AVAILABLE_PREDICATE),
+    )
+    
     @property
     def average_rating(self):
-        """Calculate average rating from reviews"""
-        if not self.reviews:
+        """Average rating from the stored review aggregates"""
+        if not self.rating_count:
             return None
-        return sum(review.rating for review in self.reviews) / len(self.reviews)
+        return self.rating_sum / self.rating_count
     
     @property
     def longitude(self):
         """Get longitude from location point"""
-        if self.location:
-            # Extract longitude from WKB format
-            point = self.location.data
-            return point.x
+        if self.location is not None:
+            # Decode the WKB point
+            return to_shape(self.location).x
         return None
 
     @property
     def latitude(self):
         """Get latitude from location point"""
-        if self.location:
-            # Extract latitude from WKB format
-            point = self.location.data
-            return point.y
+        if self.location is not None:
+            # Decode the WKB point
+            return to_shape(self.location).y
         return None
+
+
+@event.listens_for(Property, "before_insert")
+@event.listens_for(Property, "before_update")
+def _sync_amenity_mask(mapper, connection, target):
+    target.amenity_mask = pack_amenities(target)
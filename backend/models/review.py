@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, event, inspect, update
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from models.database import Base
+from models.property import Property
 
 class Review(Base):
     __tablename__ = "reviews"
@@ -18,3 +19,41 @@ class Review(Base):
     # Relationships
     property = relationship("Property", back_populates="reviews")
     user = relationship("User", back_populates="reviews")
+
+
+def _adjust_property_rating(connection, property_id, rating_delta, count_delta):
+    """Apply a change to a property's rating_sum/rating_count in the same transaction"""
+    if property_id is None:
+        return
+    properties = Property.__table__
+    connection.execute(
+        update(properties)
+        .where(properties.c.id == property_id)
+        .values(
+            rating_sum=properties.c.rating_sum + rating_delta,
+            rating_count=properties.c.rating_count + count_delta
+        )
+    )
+
+@event.listens_for(Review, "after_insert")
+def _review_inserted(mapper, connection, target):
+    _adjust_property_rating(connection, target.property_id, target.rating, 1)
+
+@event.listens_for(Review, "after_delete")
+def _review_deleted(mapper, connection, target):
+    _adjust_property_rating(connection, target.property_id, -target.rating, -1)
+
+@event.listens_for(Review, "after_update")
+def _review_updated(mapper, connection, target):
+    state = inspect(target)
+    rating_history = state.attrs.rating.history
+    property_history = state.attrs.property_id.history
+    if not rating_history.has_changes() and not property_history.has_changes():
+        return
+    
+    old_rating = rating_history.deleted[0] if rating_history.deleted else target.rating
+    old_property_id = property_history.deleted[0] if property_history.deleted else target.property_id
+    
+    # Move the review out of its old aggregate and into the new one
+    _adjust_property_rating(connection, old_property_id, -old_rating, -1)
+    _adjust_property_rating(connection, target.property_id, target.rating, 1)
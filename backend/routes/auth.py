@@ -3,10 +3,11 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
 
-from models.database import get_db
+from models.database import get_async_db
 from models.user import User
 from utils.security import create_access_token, get_current_active_user
 from config import settings
@@ -44,17 +45,17 @@ class UserResponse(BaseModel):
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     OAuth2 compatible token login, get an access token for future requests
     """
     # Try to authenticate with username
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = (await db.execute(select(User).where(User.username == form_data.username))).scalars().first()
     
     # If not found, try with email
     if not user:
-        user = db.query(User).filter(User.email == form_data.username).first()
+        user = (await db.execute(select(User).where(User.email == form_data.username))).scalars().first()
     
     # Check if user exists and password is correct
     if not user or not user.check_password(form_data.password):
@@ -86,13 +87,13 @@ async def login_for_access_token(
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_in: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user
     """
     # Check if user with this email already exists
-    user_by_email = db.query(User).filter(User.email == user_in.email).first()
+    user_by_email = (await db.execute(select(User).where(User.email == user_in.email))).scalars().first()
     if user_by_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -100,7 +101,7 @@ async def register(
         )
     
     # Check if user with this username already exists
-    user_by_username = db.query(User).filter(User.username == user_in.username).first()
+    user_by_username = (await db.execute(select(User).where(User.username == user_in.username))).scalars().first()
     if user_by_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -119,8 +120,8 @@ async def register(
     
     # Save user to database
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     return user
 
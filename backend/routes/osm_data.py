@@ -2,10 +2,24 @@
 Real-data API endpoint using OpenStreetMap for PG/Flat Finder
 """
 from fastapi import APIRouter, Query, HTTPException
-import requests
+from fastapi.responses import StreamingResponse
+from geoalchemy2 import Geometry
+from sqlalchemy import cast, func, select
+import httpx
+import json
 import logging
-from typing import List, Optional, Dict, Any
-import time
+import math
+from typing import AsyncIterator, List, Optional, Dict, Any
+
+from config import settings
+from models.database import AsyncSessionLocal
+from models.osm_accommodation import OsmAccommodation
+from models.property import make_geography_point
+from utils.cache import TTLCache, MISSING
+from utils.geo import haversine_km, haversine_km_many
+from utils.http_client import get_http_client
+from utils.overpass import aiter_elements, aiter_results, build_overpass_query, element_to_result
+from utils.rate_limit import AsyncTokenBucket
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -17,14 +31,302 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Cache of Nominatim results keyed on the normalized query text
+geocode_cache = TTLCache(
+    maxsize=settings.GEOCODE_CACHE_SIZE,
+    ttl=settings.GEOCODE_CACHE_TTL_SECONDS
+)
+
+# Cache of processed Overpass results keyed on (grid cell, radius bucket, types)
+overpass_cache = TTLCache(
+    maxsize=settings.OVERPASS_CACHE_SIZE,
+    ttl=settings.OVERPASS_CACHE_TTL_SECONDS
+)
+
+# Global Nominatim budget shared by every request (and every worker when a state file is set)
+nominatim_rate_limiter = AsyncTokenBucket(
+    rate=settings.NOMINATIM_RATE_LIMIT_PER_SECOND,
+    capacity=settings.NOMINATIM_RATE_LIMIT_BURST,
+    state_path=settings.NOMINATIM_RATE_LIMIT_STATE_FILE
+)
+
+# Unknown locations are cached for a shorter time in case OSM data is fixed
+NEGATIVE_GEOCODE_TTL_SECONDS = min(3600.0, settings.GEOCODE_CACHE_TTL_SECONDS)
+
+
+def normalize_geocode_query(query: str) -> str:
+    """
+    Fold case and collapse whitespace so "KIET  ghaziabad" and "kiet Ghaziabad" share a cache entry
+    """
+    return " ".join(query.split()).casefold()
+
+
+async def geocode_location(client: httpx.AsyncClient, query: str) -> Optional[Dict[str, Any]]:
+    """
+    Resolve a location query to the first Nominatim match, using the geocode cache.
+    
+    Returns None when Nominatim has no match for the query.
+    """
+    cache_key = normalize_geocode_query(query)
+    cached = geocode_cache.get(cache_key)
+    if cached is not MISSING:
+        logger.info(f"Geocode cache hit: {query}")
+        return cached
+    
+    # Only delays the request when the 1 req/s budget is actually used up
+    await nominatim_rate_limiter.acquire()
+    
+    logger.info(f"Geocoding location: {query}")
+    geo_response = await client.get(
+        "https://nominatim.openstreetmap.org/search",
+        params={
+            "q": query,
+            "format": "json",
+            "limit": 1,
+            "addressdetails": 1
+        }
+    )
+    
+    if geo_response.status_code != 200:
+        logger.error(f"Nominatim API error: {geo_response.status_code}")
+        raise HTTPException(status_code=502, detail="Geocoding service unavailable")
+        
+    geo_data = geo_response.json()
+    
+    if not geo_data:
+        geocode_cache.set(cache_key, None, ttl=NEGATIVE_GEOCODE_TTL_SECONDS)
+        return None
+    
+    location = geo_data[0]
+    geocode_cache.set(cache_key, location)
+    return location
+
+
+async def stream_overpass(
+    client: httpx.AsyncClient,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    accommodation_types: List[str]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Query the Overpass API for accommodations around a point, yielding result dicts
+    one at a time while the response body is still downloading
+    """
+    # Build a single-pass Overpass query for the selected accommodation types
+    overpass_query = build_overpass_query(lat, lon, int(radius_km * 1000), accommodation_types)
+    if overpass_query is None:
+        return
+    
+    logger.info(f"Querying Overpass API around coordinates: {lat}, {lon}")
+    
+    # Query Overpass API for accommodations, parsing elements as bytes arrive
+    async with client.stream(
+        "POST",
+        "https://overpass-api.de/api/interpreter",
+        data={"data": overpass_query}
+    ) as overpass_response:
+        if overpass_response.status_code != 200:
+            logger.error(f"Overpass API error: {overpass_response.status_code}")
+            raise HTTPException(status_code=502, detail="Accommodation search service unavailable")
+        
+        # Process and enrich the results, dropping duplicate (type, id) elements
+        try:
+            async for result in aiter_results(aiter_elements(overpass_response.aiter_bytes())):
+                yield result
+        except ValueError as e:
+            # Truncated payload or an Overpass runtime remark (timeout, out of memory)
+            logger.error(f"Overpass response incomplete: {e}")
+            raise HTTPException(status_code=502, detail="Accommodation search service returned an incomplete response")
+
+
+def overpass_cache_key(lat: float, lon: float, radius_km: float, accommodation_types: List[str]):
+    """
+    Snap a search to its grid cell and radius bucket.
+    
+    Returns (cache key, snapped lat, snapped lon, radius to query around the snapped point).
+    The query radius is widened by half a cell diagonal so the cached results cover any
+    search centre inside the cell; callers filter back down to their exact radius.
+    """
+    cell = settings.OVERPASS_CACHE_GRID_DEG
+    step = settings.OVERPASS_CACHE_RADIUS_STEP_KM
+    
+    snapped_lat = round(round(lat / cell) * cell, 6)
+    snapped_lon = round(round(lon / cell) * cell, 6)
+    radius_bucket = max(1, math.ceil(radius_km / step)) * step
+    half_diagonal_km = haversine_km(snapped_lat, snapped_lon, snapped_lat + cell / 2, snapped_lon + cell / 2)
+    
+    types_key = ",".join(sorted(set(accommodation_types)))
+    key = f"{snapped_lat:.6f},{snapped_lon:.6f}|{radius_bucket:g}|{types_key}"
+    return key, snapped_lat, snapped_lon, radius_bucket + half_diagonal_km
+
+
+async def iter_overpass_cached(
+    client: httpx.AsyncClient,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    accommodation_types: List[str]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield accommodations within radius_km of (lat, lon), answering nearby searches from the
+    Overpass cache. On a miss results are yielded as they stream in and the cell is cached
+    once the download completes.
+    """
+    key, snapped_lat, snapped_lon, query_radius_km = overpass_cache_key(lat, lon, radius_km, accommodation_types)
+    
+    cell_results = overpass_cache.get(key)
+    if cell_results is not MISSING:
+        logger.info(f"Overpass cache hit: {key}")
+        # Trim the cell-wide result set to the exact search circle in one vectorized pass
+        distances = haversine_km_many(
+            lat, lon,
+            [result["latitude"] for result in cell_results],
+            [result["longitude"] for result in cell_results]
+        )
+        for result, distance in zip(cell_results, distances):
+            if distance <= radius_km:
+                yield result
+        return
+    
+    cell_results = []
+    async for result in stream_overpass(client, snapped_lat, snapped_lon, query_radius_km, accommodation_types):
+        cell_results.append(result)
+        if haversine_km(lat, lon, result["latitude"], result["longitude"]) <= radius_km:
+            yield result
+    overpass_cache.set(key, cell_results)
+
+
+async def query_local_accommodations(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    accommodation_types: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Radius search over the imported osm_accommodations table, nearest first
+    """
+    point = make_geography_point(lat, lon)
+    geometry = cast(OsmAccommodation.location, Geometry)
+    
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(
+            select(
+                OsmAccommodation.osm_type,
+                OsmAccommodation.osm_id,
+                OsmAccommodation.tags,
+                func.ST_Y(geometry),
+                func.ST_X(geometry)
+            )
+            .where(func.ST_DWithin(OsmAccommodation.location, point, radius_km * 1000))
+            .where(OsmAccommodation.accommodation_types.overlap(accommodation_types))
+            .order_by(OsmAccommodation.location.op("<->")(point))
+        )).all()
+    
+    # Rebuild Overpass-shaped elements so results match the Overpass path exactly
+    return [
+        element_to_result({"type": osm_type, "id": osm_id, "lat": el_lat, "lon": el_lon, "tags": tags})
+        if osm_type == "node" else
+        element_to_result({"type": osm_type, "id": osm_id, "center": {"lat": el_lat, "lon": el_lon}, "tags": tags})
+        for osm_type, osm_id, tags, el_lat, el_lon in rows
+    ]
+
+
+async def iter_accommodations(
+    client: httpx.AsyncClient,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    accommodation_types: List[str]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield accommodations from the configured source (OSM_SEARCH_SOURCE)
+    """
+    if settings.OSM_SEARCH_SOURCE == "local":
+        results = await query_local_accommodations(lat, lon, radius_km, accommodation_types)
+        for result in results:
+            yield result
+        return
+    
+    async for result in iter_overpass_cached(client, lat, lon, radius_km, accommodation_types):
+        yield result
+
+
+def load_overpass_cache() -> None:
+    """
+    Restore the persisted Overpass cache, if a cache file is configured
+    """
+    if settings.OVERPASS_CACHE_PATH:
+        loaded = overpass_cache.load(settings.OVERPASS_CACHE_PATH)
+        logger.info(f"Loaded {loaded} Overpass cache entries from {settings.OVERPASS_CACHE_PATH}")
+
+
+def save_overpass_cache() -> None:
+    """
+    Persist the Overpass cache, if a cache file is configured
+    """
+    if settings.OVERPASS_CACHE_PATH:
+        try:
+            overpass_cache.save(settings.OVERPASS_CACHE_PATH)
+        except OSError as e:
+            logger.error(f"Could not save Overpass cache: {e}")
+
+
+def _ndjson_line(event: Dict[str, Any]) -> bytes:
+    return json.dumps(event).encode() + b"\n"
+
+
+async def stream_search_events(
+    client: httpx.AsyncClient,
+    location_info: Dict[str, Any],
+    radius_km: float,
+    accommodation_types: List[str]
+) -> AsyncIterator[bytes]:
+    """
+    Produce the NDJSON event stream for a streamed search
+    """
+    yield _ndjson_line({
+        "type": "location",
+        "success": True,
+        "location": location_info,
+        "search_radius_km": radius_km
+    })
+    
+    total_results = 0
+    batch = []
+    try:
+        async for result in iter_accommodations(
+            client, location_info["latitude"], location_info["longitude"], radius_km, accommodation_types
+        ):
+            batch.append(result)
+            if len(batch) >= settings.OSM_STREAM_BATCH_SIZE:
+                total_results += len(batch)
+                yield _ndjson_line({"type": "results", "results": batch})
+                batch = []
+    except Exception as e:
+        # Headers are already sent, so failures are reported in-band
+        logger.error(f"Error while streaming search results: {str(e)}")
+        detail = e.detail if isinstance(e, HTTPException) else "Search failed"
+        yield _ndjson_line({"type": "error", "detail": detail})
+        return
+    
+    if batch:
+        total_results += len(batch)
+        yield _ndjson_line({"type": "results", "results": batch})
+    yield _ndjson_line({"type": "done", "total_results": total_results})
+
+
 @router.get("/search")
 async def search_accommodation(
-    query: str = Query(..., description="Location to search around"),
+    query: Optional[str] = Query(None, description="Location to search around"),
+    latitude: Optional[float] = Query(None, description="Search centre latitude (skips geocoding)"),
+    longitude: Optional[float] = Query(None, description="Search centre longitude (skips geocoding)"),
     radius_km: float = Query(2.0, description="Search radius in kilometers"),
     accommodation_types: Optional[List[str]] = Query(
         ["hostel", "dormitory", "apartments", "hotel", "guest_house"],
         description="Types of accommodation to search for"
-    )
+    ),
+    stream: bool = Query(False, description="Stream NDJSON events (location first, then result batches)")
 ):
     """
     Search for real accommodation data around a location using OpenStreetMap.
@@ -32,34 +334,34 @@ async def search_accommodation(
     This endpoint uses:
     1. Nominatim API to convert location text to coordinates
     2. Overpass API to find accommodations near those coordinates
+    
+    With stream=true the response is newline-delimited JSON: a "location" event, then
+    "results" events carrying batches as they are parsed, then a final "done" event
+    (or an "error" event if the upstream search fails part-way).
+    
+    When OSM_SEARCH_SOURCE=local, accommodations come from the imported osm_accommodations
+    table instead of Overpass; passing latitude/longitude then avoids any network call.
     """
+    if latitude is None or longitude is None:
+        if not query:
+            raise HTTPException(status_code=400, detail="Provide either query or latitude and longitude")
+    
     try:
-        # Custom user agent as required by OSM API usage policy
-        headers = {"User-Agent": "PG-Flat-Finder/1.0"}
-        
-        # Step 1: Get coordinates from location query using Nominatim
-        logger.info(f"Geocoding location: {query}")
-        geo_response = requests.get(
-            "https://nominatim.openstreetmap.org/search",
-            params={
-                "q": query,
-                "format": "json",
-                "limit": 1,
-                "addressdetails": 1
-            },
-            headers=headers
-        )
+        # Shared keep-alive client (User-Agent header is set on the client)
+        client = get_http_client()
         
-        # Ensure we don't hit rate limits
-        time.sleep(1)
-        
-        if geo_response.status_code != 200:
-            logger.error(f"Nominatim API error: {geo_response.status_code}")
-            raise HTTPException(status_code=502, detail="Geocoding service unavailable")
-            
-        geo_data = geo_response.json()
+        # Step 1: Get coordinates from location query using Nominatim (cached)
+        if latitude is not None and longitude is not None:
+            location = {
+                "lat": latitude,
+                "lon": longitude,
+                "display_name": query or f"{latitude}, {longitude}",
+                "address": {}
+            }
+        else:
+            location = await geocode_location(client, query)
         
-        if not geo_data:
+        if location is None:
             return {
                 "success": False,
                 "message": f"Location '{query}' not found",
@@ -67,145 +369,51 @@ async def search_accommodation(
             }
             
         # Extract location data
-        location = geo_data[0]
         lat = float(location["lat"])
         lon = float(location["lon"])
         display_name = location["display_name"]
         address = location.get("address", {})
-        
-        # Calculate radius in meters
-        radius = int(radius_km * 1000)
-        
-        # Step 2: Build Overpass query for accommodations
-        # Create a search for each accommodation type
-        query_parts = []
-        
-        # Map our accommodation types to OSM tags
-        tag_mapping = {
-            "hostel": ["tourism=hostel"],
-            "dormitory": ["amenity=dormitory", "building=dormitory"],
-            "apartments": ["building=apartments"],
-            "flat": ["building=residential", "residential=apartment"],
-            "pg": ["leisure=lodging", "amenity=lodging", "tourism=guest_house"],
-            "hotel": ["tourism=hotel"],
-            "guest_house": ["tourism=guest_house"]
+        location_info = {
+            "display_name": display_name,
+            "latitude": lat,
+            "longitude": lon,
+            "address": address
         }
         
-        # Build query parts for each selected accommodation type
-        for acc_type in accommodation_types:
-            if acc_type in tag_mapping:
-                for tag in tag_mapping[acc_type]:
-                    key, value = tag.split("=")
-                    query_parts.append(f'node["{key}"="{value}"](around:{radius},{lat},{lon});')
-                    query_parts.append(f'way["{key}"="{value}"](around:{radius},{lat},{lon});')
-                    query_parts.append(f'relation["{key}"="{value}"](around:{radius},{lat},{lon});')
-        
-        # Combine all query parts
-        overpass_query = f"""
-        [out:json][timeout:25];
-        (
-            {' '.join(query_parts)}
-        );
-        out body;
-        out center;
-        """
-        
-        logger.info(f"Querying Overpass API around coordinates: {lat}, {lon}")
-        
-        # Step 3: Query Overpass API for accommodations
-        overpass_response = requests.post(
-            "https://overpass-api.de/api/interpreter",
-            data={"data": overpass_query}
-        )
+        if stream:
+            return StreamingResponse(
+                stream_search_events(client, location_info, radius_km, accommodation_types),
+                media_type="application/x-ndjson"
+            )
         
-        if overpass_response.status_code != 200:
-            logger.error(f"Overpass API error: {overpass_response.status_code}")
-            raise HTTPException(status_code=502, detail="Accommodation search service unavailable")
+        # Step 2: Find accommodations around the coordinates (local table or cached Overpass)
+        results = [result async for result in iter_accommodations(client, lat, lon, radius_km, accommodation_types)]
             
-        overpass_data = overpass_response.json()
-        
-        # Step 4: Process and enrich the results
-        results = []
-        for element in overpass_data.get("elements", []):
-            element_type = element.get("type")
-            tags = element.get("tags", {})
-            
-            # Get coordinates based on element type
-            if element_type == "node":
-                element_lat = element.get("lat")
-                element_lon = element.get("lon")
-            else:
-                # For ways and relations, use the center point
-                center = element.get("center", {})
-                element_lat = center.get("lat")
-                element_lon = center.get("lon")
-                
-            # Skip elements without coordinates
-            if not element_lat or not element_lon:
-                continue
-                
-            # Determine accommodation type
-            acc_type = None
-            if tags.get("tourism") in ["hostel", "hotel", "guest_house"]:
-                acc_type = tags.get("tourism")
-            elif tags.get("amenity") in ["dormitory", "lodging"]:
-                acc_type = tags.get("amenity")
-            elif tags.get("building") in ["apartments", "dormitory", "residential"]:
-                acc_type = tags.get("building")
-            elif tags.get("residential") == "apartment":
-                acc_type = "flat"
-            else:
-                acc_type = "accommodation"
-                
-            # Create result object with all available details
-            result = {
-                "id": element.get("id"),
-                "name": tags.get("name", f"Unnamed {acc_type.title()}"),
-                "type": acc_type,
-                "latitude": element_lat,
-                "longitude": element_lon,
-                "address": {
-                    "street": tags.get("addr:street"),
-                    "housenumber": tags.get("addr:housenumber"),
-                    "city": tags.get("addr:city"),
-                    "state": tags.get("addr:state"),
-                    "postcode": tags.get("addr:postcode"),
-                    "country": tags.get("addr:country")
-                },
-                "contact": {
-                    "phone": tags.get("phone"),
-                    "website": tags.get("website"),
-                    "email": tags.get("email")
-                },
-                "amenities": {
-                    "internet": tags.get("internet") == "yes" or tags.get("wifi") == "yes",
-                    "wheelchair": tags.get("wheelchair") == "yes",
-                    "parking": tags.get("parking") == "yes"
-                },
-                "details": {
-                    "rooms": tags.get("rooms"),
-                    "stars": tags.get("stars"),
-                    "description": tags.get("description")
-                },
-                "original_tags": tags  # Include all original tags for reference
-            }
-            
-            results.append(result)
-            
-        # Step 5: Return the results
+        # Step 3: Return the results
         return {
             "success": True,
-            "location": {
-                "display_name": display_name,
-                "latitude": lat,
-                "longitude": lon,
-                "address": address
-            },
+            "location": location_info,
             "search_radius_km": radius_km,
             "total_results": len(results),
             "results": results
         }
         
+    except HTTPException:
+        raise
+    except httpx.HTTPError as e:
+        logger.error(f"Upstream request failed in search_accommodation: {str(e)}")
+        raise HTTPException(status_code=502, detail="Upstream map service unavailable")
     except Exception as e:
         logger.error(f"Error in search_accommodation: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Report hit/miss counters for the OSM lookup caches
+    """
+    return {
+        "geocode": geocode_cache.stats(),
+        "overpass": overpass_cache.stats()
+    }
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel, Field
 import enum
 from datetime import datetime
-from .properties_utils import enhance_property_details
+from utils.geo import within_radius
 
 # Enum definitions (simplified)
 class PropertyType(str, enum.Enum):
@@ -519,30 +519,18 @@ async def get_nearby_properties(
     """
     Get properties near a specific location within a radius
     """
-    from math import radians, cos, sin, asin, sqrt
-    
-    # Haversine formula to calculate distance between two points
-    def haversine(lat1, lon1, lat2, lon2):
-        # Convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371  # Radius of earth in kilometers
-        return c * r
-    
-    # Filter properties within radius
+    # Vectorized haversine over all mock coordinates, bounding-box prefiltered
+    indices, distances = within_radius(
+        latitude, longitude, radius_km,
+        [prop["latitude"] for prop in MOCK_PROPERTIES],
+        [prop["longitude"] for prop in MOCK_PROPERTIES]
+    )
     nearby_properties = []
-    for prop in MOCK_PROPERTIES:
-        distance = haversine(latitude, longitude, prop["latitude"], prop["longitude"])
-        if distance <= radius_km:
-            # Add distance to property for frontend use
-            prop_copy = prop.copy()
-            prop_copy["distance_km"] = round(distance, 2)
-            nearby_properties.append(prop_copy)
+    for index, distance in zip(indices, distances):
+        # Add distance to property for frontend use
+        prop_copy = MOCK_PROPERTIES[index].copy()
+        prop_copy["distance_km"] = round(float(distance), 2)
+        nearby_properties.append(prop_copy)
     
     # Apply other filters
     filtered_properties = nearby_properties
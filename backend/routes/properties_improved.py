@@ -3,11 +3,20 @@ Improved Property Routes with comprehensive filtering and detailed responses
 """
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 import enum
 from datetime import datetime
-from sqlalchemy.orm import Session
-from models.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from models.database import get_async_db
+from utils.amenities import amenity_mask, amenity_filter_masks, amenity_mask_clause, matches_amenities
+from utils.pagination import encode_cursor, decode_cursor
+from utils.property_details import enhance_property, enhance_property_details
+from utils.property_store import PropertyStore
+from utils.serialization import property_projection, rows_to_dicts
+from utils.spatial_index import GridIndex
+from utils.nearby_cache import NearbyCache
 
 # Enum definitions
 class PropertyType(str, enum.Enum):
@@ -159,6 +168,44 @@ MOCK_PROPERTIES = [
     }
 ]
 
+# Columnar view of MOCK_PROPERTIES used by the listing filters; invalidate it on writes.
+# Amenity masks live in its amenity_mask column, not in the records served to clients
+property_store = PropertyStore(MOCK_PROPERTIES)
+
+# Response fields of the database nearby query, selected as plain columns in this order
+NEARBY_RESULT_KEYS, NEARBY_RESULT_COLUMNS = property_projection((
+    "id", "title", "description", "property_type", "address", "city", "state", "zipcode",
+    "latitude", "longitude", "price", "price_type", "room_type", "gender", "food_facility",
+    "college_name", "college_distance_km", "has_wifi", "has_ac", "has_parking", "has_tv",
+    "has_kitchen", "has_washing_machine", "has_gym", "has_study_room", "has_mess",
+    "has_laundry", "has_hot_water", "contact_name", "contact_phone", "contact_email",
+    "main_image_url", "is_available", "is_verified", "created_at", "updated_at", "owner_id",
+    "average_rating",
+))
+NEARBY_RESPONSE_KEYS = NEARBY_RESULT_KEYS + ("distance_km",)
+
+# Grid index over the mock coordinates for the nearby fallback; kept in step with writes
+spatial_index = GridIndex(settings.SPATIAL_INDEX_CELL_DEG)
+for _prop in MOCK_PROPERTIES:
+    if _prop["is_available"]:
+        spatial_index.insert(_prop["id"], _prop["latitude"], _prop["longitude"], _prop)
+
+# Campuses most nearby searches centre on; their result lists over the mock records are
+# precomputed for the fallback path. With the database up, searches centred on a row of
+# the colleges table are answered from property_college_distances, which the Property and
+# College write listeners keep current.
+MOCK_CAMPUSES = [
+    {"name": "KIET Group of Institutions", "latitude": 28.7525, "longitude": 77.4970},
+]
+
+nearby_cache = NearbyCache(
+    spatial_index,
+    max_radius_km=settings.NEARBY_CACHE_MAX_RADIUS_KM,
+    precision=settings.NEARBY_CACHE_GEOHASH_PRECISION
+)
+for _campus in MOCK_CAMPUSES:
+    nearby_cache.register(_campus["name"], _campus["latitude"], _campus["longitude"])
+
 # Schemas
 class PropertyBase(BaseModel):
     title: str
@@ -220,63 +267,6 @@ class PropertyResponse(PropertyBase):
     class Config:
         from_attributes = True
 
-# Utility functions
-def enhance_property_details(properties: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    Ensures all properties have complete information for display
-    """
-    enhanced_properties = []
-    
-    for prop in properties:
-        # Create a copy to avoid modifying the original
-        enhanced_prop = prop.copy()
-        
-        # Ensure location information is complete
-        if "latitude" not in enhanced_prop or enhanced_prop["latitude"] is None:
-            enhanced_prop["latitude"] = 0.0
-        if "longitude" not in enhanced_prop or enhanced_prop["longitude"] is None:
-            enhanced_prop["longitude"] = 0.0
-            
-        # Ensure all boolean fields exist with defaults
-        boolean_fields = [
-            "has_wifi", "has_ac", "has_parking", "has_tv", "has_kitchen", 
-            "has_washing_machine", "has_gym", "has_study_room", 
-            "has_mess", "has_laundry", "has_hot_water", "is_available"
-        ]
-        for field in boolean_fields:
-            if field not in enhanced_prop or enhanced_prop[field] is None:
-                enhanced_prop[field] = False
-                
-        # Ensure all string fields have values
-        string_fields = [
-            "title", "description", "address", "city", "state", "zipcode",
-            "contact_name", "contact_phone", "contact_email", "main_image_url"
-        ]
-        for field in string_fields:
-            if field not in enhanced_prop or enhanced_prop[field] is None:
-                enhanced_prop[field] = ""
-                
-        # Ensure numeric fields have defaults
-        if "price" not in enhanced_prop or enhanced_prop["price"] is None:
-            enhanced_prop["price"] = 0
-        if "bedrooms" not in enhanced_prop and "room_type" not in enhanced_prop:
-            enhanced_prop["bedrooms"] = 1
-        if "bathrooms" not in enhanced_prop:
-            enhanced_prop["bathrooms"] = 1
-            
-        # Convert any date fields to string format
-        date_fields = ["created_at", "updated_at", "available_from"]
-        for field in date_fields:
-            if field in enhanced_prop and not isinstance(enhanced_prop[field], str):
-                try:
-                    enhanced_prop[field] = enhanced_prop[field].isoformat()
-                except AttributeError:
-                    enhanced_prop[field] = str(enhanced_prop[field])
-        
-        enhanced_properties.append(enhanced_prop)
-    
-    return enhanced_properties
-
 # Routes
 @router.post("/", response_model=PropertyResponse, status_code=status.HTTP_201_CREATED)
 async def create_property(property_in: PropertyCreate):
@@ -301,6 +291,9 @@ async def create_property(property_in: PropertyCreate):
     
     # Add to mock database
     MOCK_PROPERTIES.append(new_property)
+    property_store.invalidate()
+    spatial_index.insert(new_property["id"], new_property["latitude"], new_property["longitude"], new_property)
+    nearby_cache.update_point(new_property["id"], new_property["latitude"], new_property["longitude"], new_property)
     
     return new_property
 
@@ -308,6 +301,7 @@ async def create_property(property_in: PropertyCreate):
 async def get_properties(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     property_type: Optional[PropertyType] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
@@ -339,131 +333,60 @@ async def get_properties(
 ):
     """
     Get all properties with optional filters
-    """
-    # Start with all properties
-    filtered_properties = MOCK_PROPERTIES.copy()
-    
-    # Apply all filters in sequence
-    if property_type:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("property_type") == property_type]
-    
-    if min_price is not None:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("price", 0) >= min_price]
-    
-    if max_price is not None:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("price", float('inf')) <= max_price]
-    
-    if bedrooms is not None:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("bedrooms") == bedrooms]
-        
-    if bathrooms is not None:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("bathrooms") == bathrooms]
     
-    # Generic location search (checks all location fields)
-    if location:
-        location_lower = location.lower()
-        filtered_properties = [p for p in filtered_properties 
-                              if (location_lower in p.get("address", "").lower() or
-                                 location_lower in p.get("city", "").lower() or
-                                 location_lower in p.get("state", "").lower() or
-                                 location_lower in p.get("zipcode", "").lower() or
-                                 location_lower in p.get("college_name", "").lower())]
-    
-    if city:
-        city_lower = city.lower()
-        filtered_properties = [p for p in filtered_properties 
-                              if city_lower in p.get("city", "").lower()]
-    
-    if state:
-        state_lower = state.lower()
-        filtered_properties = [p for p in filtered_properties 
-                              if state_lower in p.get("state", "").lower()]
-    
-    if zipcode:
-        filtered_properties = [p for p in filtered_properties 
-                              if zipcode in p.get("zipcode", "")]
-    
-    if is_available is not None:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("is_available", False) == is_available]
-    
-    # Apply student-focused filters
-    if room_type:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("room_type") == room_type]
-    
-    if gender:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("gender") == gender or p.get("gender") == GenderPreference.ANY]
-    
-    if food_facility:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("food_facility") == food_facility]
-    
-    if college_name:
-        college_name_lower = college_name.lower()
-        filtered_properties = [p for p in filtered_properties 
-                              if college_name_lower in p.get("college_name", "").lower()]
-    
-    if max_college_distance is not None:
-        filtered_properties = [p for p in filtered_properties 
-                              if p.get("college_distance_km", float('inf')) <= max_college_distance]
-    
-    # Apply amenity filters
-    if has_wifi:
-        filtered_properties = [p for p in filtered_properties if p.get("has_wifi", False)]
-        
-    if has_ac:
-        filtered_properties = [p for p in filtered_properties if p.get("has_ac", False)]
-        
-    if has_parking:
-        filtered_properties = [p for p in filtered_properties if p.get("has_parking", False)]
-        
-    if has_tv:
-        filtered_properties = [p for p in filtered_properties if p.get("has_tv", False)]
-        
-    if has_kitchen:
-        filtered_properties = [p for p in filtered_properties if p.get("has_kitchen", False)]
-        
-    if has_washing_machine:
-        filtered_properties = [p for p in filtered_properties if p.get("has_washing_machine", False)]
-        
-    if has_gym:
-        filtered_properties = [p for p in filtered_properties if p.get("has_gym", False)]
-        
-    if has_study_room:
-        filtered_properties = [p for p in filtered_properties if p.get("has_study_room", False)]
-        
-    if has_mess:
-        filtered_properties = [p for p in filtered_properties if p.get("has_mess", False)]
-    
-    if has_laundry:
-        filtered_properties = [p for p in filtered_properties if p.get("has_laundry", False)]
-    
-    if has_hot_water:
-        filtered_properties = [p for p in filtered_properties if p.get("has_hot_water", False)]
-    
-    # Sort properties by price (lowest first) by default
-    filtered_properties = sorted(filtered_properties, key=lambda x: x.get("price", float('inf')))
+    Pass the returned next_cursor as `cursor` to fetch the following page; `skip` is
+    only applied when no cursor is given.
+    """
+    # Requested amenities as one mask
+    required_amenities, _ = amenity_filter_masks({
+        "has_wifi": has_wifi,
+        "has_ac": has_ac,
+        "has_parking": has_parking,
+        "has_tv": has_tv,
+        "has_kitchen": has_kitchen,
+        "has_washing_machine": has_washing_machine,
+        "has_gym": has_gym,
+        "has_study_room": has_study_room,
+        "has_mess": has_mess,
+        "has_laundry": has_laundry,
+        "has_hot_water": has_hot_water,
+    }, allow_forbidden=False)
+    
+    # Evaluate every filter in one vectorized pass over the column store
+    mask = property_store.match(
+        property_type=property_type,
+        min_price=min_price,
+        max_price=max_price,
+        bedrooms=bedrooms,
+        bathrooms=bathrooms,
+        location=location,
+        city=city,
+        state=state,
+        zipcode=zipcode,
+        is_available=is_available,
+        room_type=room_type,
+        genders=[gender, GenderPreference.ANY] if gender else None,
+        food_facility=food_facility,
+        college_name=college_name,
+        max_college_distance=max_college_distance,
+        required_amenities=required_amenities,
+    )
+    filtered_count = int(mask.sum())
+    
+    # Apply pagination ordered by (price, id): seek past the cursor, or fall back to offset
+    after = tuple(decode_cursor(cursor, 2)) if cursor else None
+    page, has_more = property_store.page_by_price(mask, after=after, skip=skip, limit=limit)
     
     # Enhance property details for complete information
-    enhanced_properties = enhance_property_details(filtered_properties)
-    
-    # Apply pagination
-    start = skip
-    end = skip + limit if skip + limit < len(enhanced_properties) else len(enhanced_properties)
+    enhanced_properties = enhance_property_details(page)
     
     # Return enhanced response with filter counts
     return {
         "total": len(MOCK_PROPERTIES),  # Total before filtering
-        "filtered_count": len(enhanced_properties),  # Count after filters applied
-        "properties": enhanced_properties[start:end],  # Paginated results
-        "has_more": end < len(enhanced_properties)  # Pagination info
+        "filtered_count": filtered_count,  # Count after filters applied
+        "properties": enhanced_properties,  # Paginated results
+        "has_more": has_more,  # Pagination info
+        "next_cursor": encode_cursor(page[-1]["price"], page[-1]["id"]) if has_more and page else None
     }
 
 @router.get("/nearby")
@@ -473,6 +396,8 @@ async def get_nearby_properties(
     radius_km: float = 5.0,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     property_type: Optional[PropertyType] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
@@ -483,34 +408,70 @@ async def get_nearby_properties(
     has_mess: Optional[bool] = None,
     has_laundry: Optional[bool] = None,
     has_wifi: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get properties near a specific location within a radius using PostGIS
+    
+    Results are ordered by (distance, id). Pass the returned next_cursor as `cursor` to
+    seek to the following page; the total match count is only computed when
+    include_total=true.
     """
-    from sqlalchemy import text, func, and_, or_
-    from geoalchemy2.functions import ST_DWithin, ST_Distance, ST_SetSRID, ST_MakePoint
-    from models.property import Property
+    from sqlalchemy import func, or_, and_, select, cast, Float, Numeric
+    from models.property import Property, make_geography_point
+    from models.college import PropertyCollegeDistance, college_at
+
+    # Requested amenities as one mask, shared by the database and fallback paths
+    required_amenities, _ = amenity_filter_masks({
+        "has_study_room": has_study_room,
+        "has_mess": has_mess,
+        "has_laundry": has_laundry,
+        "has_wifi": has_wifi,
+    }, allow_forbidden=False)
 
     try:
-        # Create a point geometry from the provided coordinates
-        user_point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
-        
-        # Base query to find properties within the radius
-        # ST_DWithin uses meters, so we convert radius_km to meters (radius_km * 1000)
-        query = db.query(
-            Property, 
-            func.ST_Distance(
-                Property.location, 
-                user_point
-            ).label('distance_meters')
-        ).filter(
-            func.ST_DWithin(
-                Property.location,
-                user_point,
-                radius_km * 1000  # Convert km to meters
+        # A search centred on a registered campus, within the materialized radius, reads
+        # its distances from property_college_distances instead of measuring every row
+        campus_id = None
+        if radius_km <= settings.COLLEGE_DISTANCE_MAX_KM:
+            campus_id = await db.scalar(college_at(latitude, longitude))
+        
+        if campus_id is not None:
+            distances = PropertyCollegeDistance.__table__
+            knn_distance = distances.c.distance_km
+            query = select(
+                *NEARBY_RESULT_COLUMNS,
+                cast(func.round(cast(knn_distance, Numeric), 2), Float).label('distance_km'),
+                knn_distance.label('knn_distance')
+            ).join(
+                distances, distances.c.property_id == Property.id
+            ).filter(
+                distances.c.college_id == campus_id,
+                distances.c.distance_km <= radius_km
+            )
+        else:
+            # Create a geography point from the provided coordinates
+            user_point = make_geography_point(latitude, longitude)
+            
+            # Base query to find properties within the radius
+            # On geography ST_DWithin/ST_Distance work in meters, so radius_km * 1000 is exact
+            knn_distance = Property.location.op('<->')(user_point)
+            query = select(
+                *NEARBY_RESULT_COLUMNS,
+                # Distance in km rounded to 2 decimals, as a float so it encodes as a JSON number
+                cast(func.round(cast(func.ST_Distance(Property.location, user_point) / 1000, Numeric), 2), Float).label('distance_km'),
+                knn_distance.label('knn_distance')
+            ).filter(
+                func.ST_DWithin(
+                    Property.location,
+                    user_point,
+                    radius_km * 1000  # Convert km to meters
+                )
             )
-        )
+        
+        # Only listed properties, as in routes/search.py; this also matches the predicate
+        # of the partial indexes (ix_properties_available_*)
+        query = query.filter(Property.is_available == True)
         
         # Apply filters
         if property_type:
@@ -534,110 +495,59 @@ async def get_nearby_properties(
         if food_facility:
             query = query.filter(Property.food_facility == food_facility)
         
-        # Amenity filters
-        if has_study_room:
-            query = query.filter(Property.has_study_room == True)
-        
-        if has_mess:
-            query = query.filter(Property.has_mess == True)
-        
-        if has_laundry:
-            query = query.filter(Property.has_laundry == True)
+        # Amenity filters, combined into one bitwise test on the packed mask
+        if required_amenities:
+            query = query.filter(amenity_mask_clause(Property.amenity_mask, required_amenities))
         
-        if has_wifi:
-            query = query.filter(Property.has_wifi == True)
+        # Counting re-runs the whole radius query, so it is opt-in
+        total_count = None
+        if include_total:
+            total_count = await db.scalar(select(func.count()).select_from(query.subquery()))
         
-        # Order by distance
-        query = query.order_by('distance_meters')
-        
-        # Get total count before pagination
-        total_count = query.count()
+        # Seek past the last (distance, id) of the previous page
+        if cursor:
+            last_distance, last_id = decode_cursor(cursor, 2)
+            query = query.filter(or_(
+                knn_distance > last_distance,
+                and_(knn_distance == last_distance, Property.id > last_id)
+            ))
+        else:
+            query = query.offset(skip)
         
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        # Order by distance: the GiST index (KNN), or the (college_id, distance_km) index
+        # for a campus, instead of sorting every match
+        query = query.order_by(knn_distance, Property.id)
         
-        # Execute query
-        results = query.all()
+        # Fetch one extra row to know whether another page exists
+        results = (await db.execute(query.limit(limit + 1))).all()
+        has_more = len(results) > limit
+        results = results[:limit]
         
-        # Format the results
-        properties = []
-        for prop, distance_meters in results:
-            property_dict = {
-                "id": prop.id,
-                "title": prop.title,
-                "description": prop.description,
-                "property_type": prop.property_type,
-                "address": prop.address,
-                "city": prop.city,
-                "state": prop.state,
-                "zipcode": prop.zipcode,
-                "latitude": prop.latitude,
-                "longitude": prop.longitude,
-                "price": prop.price,
-                "price_type": prop.price_type,
-                "room_type": prop.room_type,
-                "gender": prop.gender,
-                "food_facility": prop.food_facility,
-                "college_name": prop.college_name,
-                "college_distance_km": prop.college_distance_km,
-                "has_wifi": prop.has_wifi,
-                "has_ac": prop.has_ac,
-                "has_parking": prop.has_parking,
-                "has_tv": prop.has_tv,
-                "has_kitchen": prop.has_kitchen,
-                "has_washing_machine": prop.has_washing_machine,
-                "has_gym": prop.has_gym,
-                "has_study_room": prop.has_study_room,
-                "has_mess": prop.has_mess,
-                "has_laundry": prop.has_laundry,
-                "has_hot_water": prop.has_hot_water,
-                "contact_name": prop.contact_name,
-                "contact_phone": prop.contact_phone,
-                "contact_email": prop.contact_email,
-                "main_image_url": prop.main_image_url,
-                "is_available": prop.is_available,
-                "is_verified": prop.is_verified,
-                "created_at": prop.created_at.isoformat() if prop.created_at else None,
-                "updated_at": prop.updated_at.isoformat() if prop.updated_at else None,
-                "owner_id": prop.owner_id,
-                "average_rating": prop.average_rating,
-                "distance_km": round(distance_meters / 1000, 2)  # Convert meters to km and round to 2 decimal places
-            }
-            properties.append(property_dict)
+        # Rows already hold exactly the response fields; pair them with the keys
+        properties = rows_to_dicts(NEARBY_RESPONSE_KEYS, results)
         
-        return {
+        last_row = results[-1] if results else None
+        return ORJSONResponse({
             "total": total_count,
             "properties": properties,
-            "has_more": total_count > (skip + limit)
-        }
+            "has_more": has_more,
+            "next_cursor": encode_cursor(last_row.knn_distance, last_row.id) if has_more else None
+        })
     except Exception as e:
         # Fallback to mock data if database query fails
         print(f"Error querying database: {e}")
         
-        # For now, return mock data but with proper error handling for production
-        from math import radians, cos, sin, asin, sqrt
-        
-        def haversine(lat1, lon1, lat2, lon2):
-            # Convert decimal degrees to radians
-            lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-            
-            # Haversine formula
-            dlon = lon2 - lon1
-            dlat = lat2 - lat1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * asin(sqrt(a))
-            r = 6371  # Radius of earth in kilometers
-            return c * r
-        
-        # Filter properties within radius
+        # Registered campuses are a slice of a precomputed mock list; other points scan only
+        # the grid cells around them, not every mock record
+        candidates = nearby_cache.lookup(latitude, longitude, radius_km)
+        if candidates is None:
+            candidates = spatial_index.query_radius(latitude, longitude, radius_km)
         nearby_properties = []
-        for prop in MOCK_PROPERTIES:
-            distance = haversine(latitude, longitude, prop["latitude"], prop["longitude"])
-            if distance <= radius_km:
-                # Add distance to property for frontend use
-                prop_copy = prop.copy()
-                prop_copy["distance_km"] = round(distance, 2)
-                nearby_properties.append(prop_copy)
+        for distance, _, prop in candidates:
+            # Add distance to property for frontend use
+            prop_copy = prop.copy()
+            prop_copy["distance_km"] = round(distance, 2)
+            nearby_properties.append(prop_copy)
         
         # Apply other filters
         filtered_properties = nearby_properties
@@ -666,30 +576,32 @@ async def get_nearby_properties(
             filtered_properties = [p for p in filtered_properties 
                                 if p.get("food_facility") == food_facility]
         
-        # Amenity filters
-        if has_study_room:
-            filtered_properties = [p for p in filtered_properties if p.get("has_study_room", False)]
-        
-        if has_mess:
-            filtered_properties = [p for p in filtered_properties if p.get("has_mess", False)]
-        
-        if has_laundry:
-            filtered_properties = [p for p in filtered_properties if p.get("has_laundry", False)]
-        
-        if has_wifi:
-            filtered_properties = [p for p in filtered_properties if p.get("has_wifi", False)]
-        
-        # Sort by distance
-        filtered_properties.sort(key=lambda x: x.get("distance_km", float('inf')))
-        
-        # Apply pagination
-        start = skip
-        end = skip + limit if skip + limit < len(filtered_properties) else len(filtered_properties)
+        # Amenity filters, packing the flags of the few candidates in range
+        if required_amenities:
+            filtered_properties = [p for p in filtered_properties 
+                                if matches_amenities(amenity_mask(p), required_amenities)]
+        
+        # Sort by distance, id breaks ties for stable cursors
+        sort_key = lambda x: (x.get("distance_km", float('inf')), x["id"])
+        filtered_properties.sort(key=sort_key)
+        total_count = len(filtered_properties)
+        
+        # Apply pagination: seek past the cursor, or fall back to offset
+        if cursor:
+            last_distance, last_id = decode_cursor(cursor, 2)
+            filtered_properties = [p for p in filtered_properties if sort_key(p) > (last_distance, last_id)]
+            start = 0
+        else:
+            start = skip
+        end = min(start + limit, len(filtered_properties))
+        page = filtered_properties[start:end]
+        has_more = end < len(filtered_properties)
         
         return {
-            "total": len(filtered_properties),
-            "properties": filtered_properties[start:end],
-            "has_more": end < len(filtered_properties)
+            "total": total_count,
+            "properties": page,
+            "has_more": has_more,
+            "next_cursor": encode_cursor(*sort_key(page[-1])) if has_more and page else None
         }
 
 @router.get("/{property_id}")
@@ -700,7 +612,7 @@ async def get_property(property_id: int):
     for property in MOCK_PROPERTIES:
         if property["id"] == property_id:
             # Enhance the property details
-            enhanced_property = enhance_property_details([property])[0]
+            enhanced_property = enhance_property(property)
             return enhanced_property
     
     # If property not found, raise 404 error
@@ -717,6 +629,14 @@ async def update_property(property_id: int, property_in: PropertyUpdate):
             # Update only the fields that are present in the update
             update_data = {k: v for k, v in property_in.dict(exclude_unset=True).items() if v is not None}
             MOCK_PROPERTIES[i].update(update_data)
+            property_store.invalidate()
+            # Only available listings belong in the nearby structures; a withdrawn one leaves them
+            if MOCK_PROPERTIES[i]["is_available"]:
+                spatial_index.insert(property_id, MOCK_PROPERTIES[i]["latitude"], MOCK_PROPERTIES[i]["longitude"], MOCK_PROPERTIES[i])
+                nearby_cache.update_point(property_id, MOCK_PROPERTIES[i]["latitude"], MOCK_PROPERTIES[i]["longitude"], MOCK_PROPERTIES[i])
+            else:
+                spatial_index.remove(property_id)
+                nearby_cache.remove_point(property_id)
             MOCK_PROPERTIES[i]["updated_at"] = datetime.now().isoformat()
             return MOCK_PROPERTIES[i]
     
@@ -733,6 +653,9 @@ async def delete_property(property_id: int):
         if property["id"] == property_id:
             # For demonstration, we just mark it as unavailable instead of actually deleting
             MOCK_PROPERTIES[i]["is_available"] = False
+            property_store.invalidate()
+            spatial_index.remove(property_id)
+            nearby_cache.remove_point(property_id)
             return
     
     # If property not found, raise 404 error
@@ -754,229 +677,3 @@ async def get_user_properties():
         "properties": enhanced_properties,
         "has_more": False
     }
-
-@router.get("/nearby")
-async def get_nearby_properties(
-    latitude: float,
-    longitude: float,
-    radius_km: float = 5.0,
-    skip: int = 0,
-    limit: int = 100,
-    property_type: Optional[PropertyType] = None,
-    min_price: Optional[float] = None,
-    max_price: Optional[float] = None,
-    room_type: Optional[RoomType] = None,
-    gender: Optional[GenderPreference] = None,
-    food_facility: Optional[FoodFacility] = None,
-    has_study_room: Optional[bool] = None,
-    has_mess: Optional[bool] = None,
-    has_laundry: Optional[bool] = None,
-    has_wifi: Optional[bool] = None,
-    db = Depends(get_db)
-):
-    """
-    Get properties near a specific location within a radius using PostGIS
-    """
-    from sqlalchemy import text, func, and_, or_
-    from geoalchemy2.functions import ST_DWithin, ST_Distance, ST_SetSRID, ST_MakePoint
-    from models.property import Property
-
-    try:
-        # Create a point geometry from the provided coordinates
-        user_point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
-        
-        # Base query to find properties within the radius
-        # ST_DWithin uses meters, so we convert radius_km to meters (radius_km * 1000)
-        query = db.query(
-            Property, 
-            func.ST_Distance(
-                Property.location, 
-                user_point
-            ).label('distance_meters')
-        ).filter(
-            func.ST_DWithin(
-                Property.location,
-                user_point,
-                radius_km * 1000  # Convert km to meters
-            )
-        )
-        
-        # Apply filters
-        if property_type:
-            query = query.filter(Property.property_type == property_type)
-            
-        if min_price is not None:
-            query = query.filter(Property.price >= min_price)
-            
-        if max_price is not None:
-            query = query.filter(Property.price <= max_price)
-            
-        if room_type:
-            query = query.filter(Property.room_type == room_type)
-            
-        if gender:
-            query = query.filter(or_(
-                Property.gender == gender,
-                Property.gender == GenderPreference.ANY
-            ))
-            
-        if food_facility:
-            query = query.filter(Property.food_facility == food_facility)
-        
-        # Amenity filters
-        if has_study_room:
-            query = query.filter(Property.has_study_room == True)
-        
-        if has_mess:
-            query = query.filter(Property.has_mess == True)
-        
-        if has_laundry:
-            query = query.filter(Property.has_laundry == True)
-        
-        if has_wifi:
-            query = query.filter(Property.has_wifi == True)
-        
-        # Order by distance
-        query = query.order_by('distance_meters')
-        
-        # Get total count before pagination
-        total_count = query.count()
-        
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
-        
-        # Execute query
-        results = query.all()
-        
-        # Format the results
-        properties = []
-        for prop, distance_meters in results:
-            property_dict = {
-                "id": prop.id,
-                "title": prop.title,
-                "description": prop.description,
-                "property_type": prop.property_type,
-                "address": prop.address,
-                "city": prop.city,
-                "state": prop.state,
-                "zipcode": prop.zipcode,
-                "latitude": prop.latitude,
-                "longitude": prop.longitude,
-                "price": prop.price,
-                "price_type": prop.price_type,
-                "room_type": prop.room_type,
-                "gender": prop.gender,
-                "food_facility": prop.food_facility,
-                "college_name": prop.college_name,
-                "college_distance_km": prop.college_distance_km,
-                "has_wifi": prop.has_wifi,
-                "has_ac": prop.has_ac,
-                "has_parking": prop.has_parking,
-                "has_tv": prop.has_tv,
-                "has_kitchen": prop.has_kitchen,
-                "has_washing_machine": prop.has_washing_machine,
-                "has_gym": prop.has_gym,
-                "has_study_room": prop.has_study_room,
-                "has_mess": prop.has_mess,
-                "has_laundry": prop.has_laundry,
-                "has_hot_water": prop.has_hot_water,
-                "contact_name": prop.contact_name,
-                "contact_phone": prop.contact_phone,
-                "contact_email": prop.contact_email,
-                "main_image_url": prop.main_image_url,
-                "is_available": prop.is_available,
-                "is_verified": prop.is_verified,
-                "created_at": prop.created_at.isoformat() if prop.created_at else None,
-                "updated_at": prop.updated_at.isoformat() if prop.updated_at else None,
-                "owner_id": prop.owner_id,
-                "average_rating": prop.average_rating,
-                "distance_km": round(distance_meters / 1000, 2)  # Convert meters to km and round to 2 decimal places
-            }
-            properties.append(property_dict)
-        
-        return {
-            "total": total_count,
-            "properties": properties,
-            "has_more": total_count > (skip + limit)
-        }
-    except Exception as e:
-        # Fallback to mock data if database query fails
-        print(f"Error querying database: {e}")
-        
-        # For now, return mock data but with proper error handling for production
-        from math import radians, cos, sin, asin, sqrt
-        
-        def haversine(lat1, lon1, lat2, lon2):
-            # Convert decimal degrees to radians
-            lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-            
-            # Haversine formula
-            dlon = lon2 - lon1
-            dlat = lat2 - lat1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * asin(sqrt(a))
-            r = 6371  # Radius of earth in kilometers
-            return c * r
-        
-        # Filter properties within radius
-        nearby_properties = []
-        for prop in MOCK_PROPERTIES:
-            distance = haversine(latitude, longitude, prop["latitude"], prop["longitude"])
-            if distance <= radius_km:
-                # Add distance to property for frontend use
-                prop_copy = prop.copy()
-                prop_copy["distance_km"] = round(distance, 2)
-                nearby_properties.append(prop_copy)
-        
-        # Apply other filters
-        filtered_properties = nearby_properties
-        
-        if property_type:
-            filtered_properties = [p for p in filtered_properties 
-                                if p["property_type"] == property_type]
-        
-        if min_price is not None:
-            filtered_properties = [p for p in filtered_properties 
-                                if p["price"] >= min_price]
-        
-        if max_price is not None:
-            filtered_properties = [p for p in filtered_properties 
-                                if p["price"] <= max_price]
-        
-        if room_type:
-            filtered_properties = [p for p in filtered_properties 
-                                if p.get("room_type") == room_type]
-        
-        if gender:
-            filtered_properties = [p for p in filtered_properties 
-                                if p.get("gender") == gender or p.get("gender") == GenderPreference.ANY]
-        
-        if food_facility:
-            filtered_properties = [p for p in filtered_properties 
-                                if p.get("food_facility") == food_facility]
-        
-        # Amenity filters
-        if has_study_room:
-            filtered_properties = [p for p in filtered_properties if p.get("has_study_room", False)]
-        
-        if has_mess:
-            filtered_properties = [p for p in filtered_properties if p.get("has_mess", False)]
-        
-        if has_laundry:
-            filtered_properties = [p for p in filtered_properties if p.get("has_laundry", False)]
-        
-        if has_wifi:
-            filtered_properties = [p for p in filtered_properties if p.get("has_wifi", False)]
-        
-        # Sort by distance
-        filtered_properties.sort(key=lambda x: x.get("distance_km", float('inf')))
-        
-        # Apply pagination
-        start = skip
-        end = skip + limit if skip + limit < len(filtered_properties) else len(filtered_properties)
-        
-        return {
-            "total": len(filtered_properties),
-            "properties": filtered_properties[start:end],
-            "has_more": end < len(filtered_properties)
-        }
@@ -1,13 +1,17 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from geoalchemy2.functions import ST_DWithin, ST_Distance, ST_Point
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, or_, and_, select, null
 from pydantic import BaseModel
 
-from models.database import get_db
-from models.property import Property, PropertyType, RoomType, GenderPreference, FoodFacility
+from config import settings
+from models.college import within_college_distance
+from models.database import get_async_db
+from models.property import Property, PropertyType, RoomType, GenderPreference, FoodFacility, make_geography_point, ADDRESS_SEARCH_COLUMNS
 from routes.properties import PropertyResponse
+from utils.amenities import amenity_filter_masks, amenity_mask_clause
+from utils.pagination import encode_cursor, decode_cursor
+from utils.serialization import property_projection, rows_response
 
 router = APIRouter(
     prefix="/search",
@@ -15,10 +19,19 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 # Schemas
 class LocationSearchResponse(PropertyResponse):
     distance_km: float = None
 
+# Response columns selected by both searches, built once from the response schema
+RESULT_KEYS, RESULT_COLUMNS = property_projection(
+    field for field in LocationSearchResponse.model_fields if field != "distance_km"
+)
+RESPONSE_KEYS = RESULT_KEYS + ("distance_km",)
+
 # Routes
 @router.get("/nearby", response_model=List[LocationSearchResponse])
 async def search_nearby_properties(
@@ -34,27 +47,36 @@ async def search_nearby_properties(
     gender: Optional[GenderPreference] = None,
     food_facility: Optional[FoodFacility] = None,
     max_college_distance: Optional[float] = None,
+    college_id: Optional[int] = None,
     has_study_room: Optional[bool] = None,
     has_mess: Optional[bool] = None,
     has_laundry: Optional[bool] = None,
     has_hot_water: Optional[bool] = None,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search for properties within a specified radius of a location
+    
+    Results are ordered by (distance, id); when more exist, the X-Next-Cursor response
+    header holds the `cursor` value for the next page.
     """
     # Convert radius to meters
     radius_meters = radius_km * 1000
     
-    # Create a point from the provided coordinates
-    point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+    # Create a geography point so distances are in meters
+    point = make_geography_point(latitude, longitude)
+    
+    # Index-assisted KNN distance, also used as the pagination key
+    knn_distance = Property.location.op("<->")(point)
     
     # Build query with proximity search
     query = (
-        db.query(
-            Property,
-            func.ST_Distance(Property.location, point).label("distance_meters")
+        select(
+            *RESULT_COLUMNS,
+            (func.ST_Distance(Property.location, point) / 1000).label("distance_km"),
+            knn_distance.label("knn_distance")
         )
         .filter(
             func.ST_DWithin(
@@ -89,45 +111,49 @@ async def search_nearby_properties(
     if food_facility:
         query = query.filter(Property.food_facility == food_facility)
     
-    if max_college_distance is not None:
+    # Distance to a specific college comes from the materialized distance table;
+    # without college_id it applies to the listing's own college_distance_km
+    if college_id is not None:
+        query = query.filter(within_college_distance(
+            college_id,
+            max_college_distance if max_college_distance is not None else settings.COLLEGE_DISTANCE_MAX_KM
+        ))
+    elif max_college_distance is not None:
         query = query.filter(Property.college_distance_km <= max_college_distance)
     
-    # Filter by student-focused amenities
-    if has_study_room is not None:
-        query = query.filter(Property.has_study_room == has_study_room)
-    
-    if has_mess is not None:
-        query = query.filter(Property.has_mess == has_mess)
-    
-    if has_laundry is not None:
-        query = query.filter(Property.has_laundry == has_laundry)
-    
-    if has_hot_water is not None:
-        query = query.filter(Property.has_hot_water == has_hot_water)
-    
-    # Order by distance (closest first)
-    query = query.order_by("distance_meters")
-    
-    # Limit results
-    query = query.limit(limit)
+    # Filter by student-focused amenities with one test on the packed mask
+    required, forbidden = amenity_filter_masks({
+        "has_study_room": has_study_room,
+        "has_mess": has_mess,
+        "has_laundry": has_laundry,
+        "has_hot_water": has_hot_water,
+    })
+    if required or forbidden:
+        query = query.filter(amenity_mask_clause(Property.amenity_mask, required, forbidden))
+    
+    # Seek past the last (distance, id) of the previous page
+    if cursor:
+        last_distance, last_id = decode_cursor(cursor, 2)
+        query = query.filter(or_(
+            knn_distance > last_distance,
+            and_(knn_distance == last_distance, Property.id > last_id)
+        ))
+    
+    # Order by distance (closest first) with an index-assisted KNN scan
+    query = query.order_by(knn_distance, Property.id)
+    
+    # Limit results, fetching one extra row to detect a following page
+    query = query.limit(limit + 1)
     
     # Execute query
-    results = query.all()
-    
-    # Process results
-    response = []
-    for property_obj, distance_meters in results:
-        # Convert property to dict
-        property_dict = {
-            **{c.name: getattr(property_obj, c.name) for c in property_obj.__table__.columns},
-            "latitude": property_obj.latitude,
-            "longitude": property_obj.longitude,
-            "average_rating": property_obj.average_rating,
-            "distance_km": distance_meters / 1000  # Convert meters to kilometers
-        }
-        response.append(property_dict)
-    
-    return response
+    results = (await db.execute(query)).all()
+    headers = {}
+    if len(results) > limit:
+        results = results[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(results[-1].knn_distance, results[-1].id)
+    
+    # Encode the row tuples directly; the projection already matches the response schema
+    return rows_response(RESPONSE_KEYS, results, headers)
 
 @router.get("/by-address", response_model=List[LocationSearchResponse])
 async def search_properties_by_address(
@@ -143,20 +169,26 @@ async def search_properties_by_address(
     gender: Optional[GenderPreference] = None,
     food_facility: Optional[FoodFacility] = None,
     max_college_distance: Optional[float] = None,
+    college_id: Optional[int] = None,
     has_study_room: Optional[bool] = None,
     has_mess: Optional[bool] = None,
     has_laundry: Optional[bool] = None,
     has_hot_water: Optional[bool] = None,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search for properties by address or city
     Note: This endpoint requires geocoding the address first,
     which will be implemented in the service layer using the geocoding API
+    
+    Address matches are ranked by trigram similarity (then id), other searches are
+    ordered by id; the X-Next-Cursor response header holds the `cursor` value for the
+    next page.
     """
-    # Build base query
-    query = db.query(Property)
+    # Build base query over the response columns only
+    query = select(*RESULT_COLUMNS, null().label("distance_km"))
     
     # Apply basic filters
     if property_type:
@@ -181,54 +213,64 @@ async def search_properties_by_address(
     if food_facility:
         query = query.filter(Property.food_facility == food_facility)
     
-    if max_college_distance is not None:
+    # Distance to a specific college comes from the materialized distance table;
+    # without college_id it applies to the listing's own college_distance_km
+    if college_id is not None:
+        query = query.filter(within_college_distance(
+            college_id,
+            max_college_distance if max_college_distance is not None else settings.COLLEGE_DISTANCE_MAX_KM
+        ))
+    elif max_college_distance is not None:
         query = query.filter(Property.college_distance_km <= max_college_distance)
     
-    # Filter by student-focused amenities
-    if has_study_room is not None:
-        query = query.filter(Property.has_study_room == has_study_room)
-    
-    if has_mess is not None:
-        query = query.filter(Property.has_mess == has_mess)
-    
-    if has_laundry is not None:
-        query = query.filter(Property.has_laundry == has_laundry)
-    
-    if has_hot_water is not None:
-        query = query.filter(Property.has_hot_water == has_hot_water)
-    
-    # Filter by address or city
+    # Filter by student-focused amenities with one test on the packed mask
+    required, forbidden = amenity_filter_masks({
+        "has_study_room": has_study_room,
+        "has_mess": has_mess,
+        "has_laundry": has_laundry,
+        "has_hot_water": has_hot_water,
+    })
+    if required or forbidden:
+        query = query.filter(amenity_mask_clause(Property.amenity_mask, required, forbidden))
+    
+    # Filter by city
     if city:
         query = query.filter(Property.city.ilike(f"%{city}%"))
     
-    if address:
-        query = query.filter(
-            Property.address.ilike(f"%{address}%") | 
-            Property.city.ilike(f"%{address}%") |
-            Property.state.ilike(f"%{address}%") |
-            Property.zipcode.ilike(f"%{address}%")
-        )
-    
     # Ensure only available properties
     query = query.filter(Property.is_available == True)
     
-    # Limit results
-    query = query.limit(limit)
-    
-    # Execute query
-    properties = query.all()
-    
-    # Process results
-    response = []
-    for property_obj in properties:
-        # Convert property to dict
-        property_dict = {
-            **{c.name: getattr(property_obj, c.name) for c in property_obj.__table__.columns},
-            "latitude": property_obj.latitude,
-            "longitude": property_obj.longitude,
-            "average_rating": property_obj.average_rating,
-            "distance_km": None  # No distance calculation for address search
-        }
-        response.append(property_dict)
-    
-    return response
+    if address:
+        # ILIKE on each column is served by its trigram index (bitmap OR);
+        # matches are ranked by the best trigram similarity across the columns
+        pattern = f"%{address}%"
+        columns = [getattr(Property, name) for name in ADDRESS_SEARCH_COLUMNS]
+        query = query.filter(or_(*(column.ilike(pattern) for column in columns)))
+        score = func.greatest(*(func.coalesce(func.similarity(column, address), 0) for column in columns))
+        
+        # Seek past the (score, id) of the previous page
+        if cursor:
+            last_score, last_id = decode_cursor(cursor, 2)
+            query = query.filter(or_(score < last_score, and_(score == last_score, Property.id > last_id)))
+        
+        # Best matches first
+        query = query.add_columns(score.label("score")).order_by(score.desc(), Property.id)
+        cursor_key = lambda row: (row.score, row.id)
+    else:
+        # Seek past the last id of the previous page
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            query = query.filter(Property.id > last_id)
+        
+        query = query.order_by(Property.id)
+        cursor_key = lambda row: (row.id,)
+    
+    # Limit results, fetching one extra row to detect a following page
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(*cursor_key(rows[-1]))
+    
+    # Encode the row tuples directly; distance_km is always null for address search
+    return rows_response(RESPONSE_KEYS, rows, headers)
@@ -0,0 +1,312 @@
+"""
+Apply OpenStreetMap change files (.osc / .osc.gz) to the osm_accommodations table
+
+Creates, modifies and deletes accommodations by OSM type + id in batches, and stores the
+replication sequence number of each applied file so the same diff is never applied twice.
+
+Usage (from the backend directory):
+    python -m scripts.apply_osm_changes 004/123/456.osc.gz 004/123/457.osc.gz [--batch-size 2000]
+
+The sequence number is taken from --sequence (single file) or from the replication path
+layout (AAA/BBB/CCC.osc.gz -> AAABBBCCC). Files at or below the stored sequence are skipped.
+
+A diff only carries the nodes that changed, so the local table can drift from OSM:
+- a way that gains accommodation tags without its nodes in the diff has no position; with
+  --fetch-missing-geometry its current geometry is read from the OSM API, otherwise it is
+  counted and logged as "missing_geometry" and needs a re-import
+- a node that moves without its way being in the diff does not update that way's center
+"""
+import argparse
+import logging
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import bindparam, select, tuple_, update
+
+from models.database import engine
+from models.osm_accommodation import OsmAccommodation
+from scripts.import_osm_extract import (
+    bbox_center,
+    delete_rows,
+    element_to_row,
+    get_sequence_number,
+    open_extract,
+    set_sequence_number,
+    upsert_rows,
+)
+from utils.http_client import DEFAULT_HEADERS
+from utils.overpass import classify_accommodation, matching_accommodation_types
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REPLICATION_PATH = re.compile(r"(\d{3})[/\\](\d{3})[/\\](\d{3})\.osc(\.gz)?$")
+
+# Source of current way geometry for ways whose nodes are not in a diff
+OSM_API_URL = "https://api.openstreetmap.org/api/0.6"
+
+
+def sequence_from_path(path: str) -> Optional[int]:
+    """Derive the sequence number from a replication-style path, if it has one"""
+    match = REPLICATION_PATH.search(path)
+    return int("".join(match.groups()[:3])) if match else None
+
+
+class ChangeBatch:
+    """
+    Pending changes keyed by (osm_type, osm_id); the last action on an element wins
+    """
+
+    def __init__(self):
+        self.upserts: Dict[tuple, Dict[str, Any]] = {}
+        self.retags: Dict[tuple, Dict[str, Any]] = {}
+        self.deletes: set = set()
+
+    def __len__(self) -> int:
+        return len(self.upserts) + len(self.retags) + len(self.deletes)
+
+    def _discard(self, key: tuple) -> None:
+        self.upserts.pop(key, None)
+        self.retags.pop(key, None)
+        self.deletes.discard(key)
+
+    def upsert(self, key: tuple, row: Dict[str, Any]) -> None:
+        self._discard(key)
+        self.upserts[key] = row
+
+    def retag(self, key: tuple, row: Dict[str, Any]) -> None:
+        self._discard(key)
+        self.retags[key] = row
+
+    def delete(self, key: tuple) -> None:
+        self._discard(key)
+        self.deletes.add(key)
+
+    def flush(self, connection) -> Dict[str, int]:
+        """
+        Write pending changes; returns how many retags hit a row, how many had none and
+        how many rows the deletes removed
+        """
+        upsert_rows(connection, list(self.upserts.values()))
+        missing = retag_rows(connection, list(self.retags.values()))
+        deleted = delete_rows(connection, list(self.deletes))
+        counts = {"retagged": len(self.retags) - len(missing), "missing_geometry": len(missing), "deleted": deleted}
+        for osm_type, osm_id in missing:
+            logger.warning(f"{osm_type}/{osm_id} became an accommodation without geometry in the diff; needs re-import")
+        self.__init__()
+        return counts
+
+
+class WayGeometrySource:
+    """
+    Current way geometry from the OSM API, for ways whose nodes are not part of a diff
+    """
+
+    def __init__(self, base_url: str = OSM_API_URL):
+        self.client = httpx.Client(base_url=base_url, headers=DEFAULT_HEADERS, timeout=30)
+
+    def center(self, way_id: int) -> Optional[Dict[str, float]]:
+        """Bounding-box center of the way's current nodes, or None if it is gone"""
+        response = self.client.get(f"/way/{way_id}/full.json")
+        if response.status_code in (404, 410):
+            return None
+        response.raise_for_status()
+        coords = [
+            (element["lat"], element["lon"])
+            for element in response.json().get("elements", [])
+            if element.get("type") == "node" and "lat" in element
+        ]
+        return bbox_center(coords)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def retag_rows(connection, rows: List[Dict[str, Any]]) -> List[tuple]:
+    """
+    Update tags of existing rows whose position cannot be recomputed from the diff
+    (a modified way whose nodes did not change keeps its stored center)
+
+    Returns the (osm_type, osm_id) keys that have no row to update. The existing keys are
+    selected first because executemany rowcounts are not reliable per statement.
+    """
+    if not rows:
+        return []
+    table = OsmAccommodation.__table__
+    keys = [(row["osm_type"], row["osm_id"]) for row in rows]
+    existing = set(connection.execute(
+        select(table.c.osm_type, table.c.osm_id).where(tuple_(table.c.osm_type, table.c.osm_id).in_(keys))
+    ).all())
+    missing = [key for key in keys if key not in existing]
+    rows = [row for row in rows if (row["osm_type"], row["osm_id"]) in existing]
+    if not rows:
+        return missing
+    stmt = (
+        update(table)
+        .where(table.c.osm_type == bindparam("key_type"))
+        .where(table.c.osm_id == bindparam("key_id"))
+        .values(
+            name=bindparam("name"),
+            acc_type=bindparam("acc_type"),
+            accommodation_types=bindparam("accommodation_types"),
+            tags=bindparam("tags")
+        )
+    )
+    connection.execute(stmt, [
+        {
+            "key_type": row["osm_type"], "key_id": row["osm_id"], "name": row["name"],
+            "acc_type": row["acc_type"], "accommodation_types": row["accommodation_types"], "tags": row["tags"]
+        }
+        for row in rows
+    ])
+    return missing
+
+
+def apply_change_file(
+    connection,
+    path: str,
+    batch_size: int,
+    geometry_source: Optional[WayGeometrySource] = None,
+) -> Dict[str, int]:
+    """
+    Stream one osmChange file into the table. Returns per-action counters; "deleted" counts
+    rows actually removed, not delete candidates.
+    """
+    counts = {"upserted": 0, "retagged": 0, "missing_geometry": 0, "deleted": 0, "skipped": 0}
+    
+    def flush() -> None:
+        for name, value in batch.flush(connection).items():
+            counts[name] += value
+    
+    node_coords: Dict[int, tuple] = {}
+    batch = ChangeBatch()
+    action = None
+    
+    with open_extract(path) as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event == "start":
+                if elem.tag in ("create", "modify", "delete"):
+                    action = elem.tag
+                continue
+            if elem.tag in ("create", "modify", "delete"):
+                # Finished action block: release its (already cleared) children
+                root.clear()
+                continue
+            if elem.tag not in ("node", "way", "relation"):
+                continue
+            
+            key = (elem.tag, int(elem.get("id")))
+            if action == "delete":
+                # Deleted elements carry no tags, so any of them may be a stored row
+                batch.delete(key)
+            else:
+                tags = {tag.get("k"): tag.get("v") for tag in elem.iter("tag")}
+                element = {"type": elem.tag, "id": key[1], "tags": tags}
+                if elem.tag == "node":
+                    element["lat"], element["lon"] = float(elem.get("lat")), float(elem.get("lon"))
+                    node_coords[key[1]] = (element["lat"], element["lon"])
+                elif elem.tag == "way":
+                    refs = [int(nd.get("ref")) for nd in elem.iter("nd")]
+                    coords = [node_coords[ref] for ref in refs if ref in node_coords]
+                    # Only trust a recomputed center when every node is in the diff
+                    element["center"] = bbox_center(coords) if len(coords) == len(refs) else None
+                    if element["center"] is None and geometry_source is not None and matching_accommodation_types(tags):
+                        element["center"] = geometry_source.center(key[1])
+                
+                row = element_to_row(element)
+                if row is not None:
+                    batch.upsert(key, row)
+                    counts["upserted"] += 1
+                elif not matching_accommodation_types(tags):
+                    if action == "modify":
+                        # The diff lacks the old tags, so the element may have lost its
+                        # accommodation tags: drop it if we had it
+                        batch.delete(key)
+                    else:
+                        # Created non-accommodations (mostly way geometry nodes) were never stored
+                        counts["skipped"] += 1
+                elif elem.tag == "way":
+                    batch.retag(key, {
+                        "osm_type": key[0], "osm_id": key[1], "name": tags.get("name"),
+                        "acc_type": classify_accommodation(tags),
+                        "accommodation_types": matching_accommodation_types(tags), "tags": tags
+                    })
+                else:
+                    counts["skipped"] += 1
+            
+            elem.clear()
+            if len(batch) >= batch_size:
+                flush()
+    
+    flush()
+    return counts
+
+
+def apply_changes(
+    paths: List[str],
+    batch_size: int = 2000,
+    sequence: Optional[int] = None,
+    fetch_missing_geometry: bool = False,
+) -> None:
+    """
+    Apply change files in order, each in its own transaction together with its sequence number
+    """
+    geometry_source = WayGeometrySource() if fetch_missing_geometry else None
+    try:
+        for path in paths:
+            _apply_change_path(path, batch_size, sequence, geometry_source)
+    finally:
+        if geometry_source is not None:
+            geometry_source.close()
+
+
+def _apply_change_path(path: str, batch_size: int, sequence: Optional[int], geometry_source) -> None:
+    """Apply one change file and its sequence number in a single transaction"""
+    sequence_number = sequence if sequence is not None else sequence_from_path(path)
+    started = time.time()
+    with engine.begin() as connection:
+        current = get_sequence_number(connection)
+        if sequence_number is not None and current is not None and sequence_number <= current:
+            logger.info(f"Skipping {path}: sequence {sequence_number} already applied (at {current})")
+            return
+        
+        counts = apply_change_file(connection, path, batch_size, geometry_source)
+        if sequence_number is not None:
+            set_sequence_number(connection, sequence_number)
+    
+    logger.info(f"Applied {os.path.basename(path)} (sequence {sequence_number}) in {time.time() - started:.1f}s: {counts}")
+    if counts["missing_geometry"]:
+        logger.warning(
+            f"{counts['missing_geometry']} accommodation ways had no geometry in {os.path.basename(path)}; "
+            "re-import the extract or rerun with --fetch-missing-geometry"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply OSM change files to the local accommodation table")
+    parser.add_argument("paths", nargs="+", help="osmChange files (.osc or .osc.gz), oldest first")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Pending changes per flush")
+    parser.add_argument("--sequence", type=int, default=None, help="Sequence number (only with a single file)")
+    parser.add_argument(
+        "--fetch-missing-geometry", action="store_true",
+        help="Read the current geometry of ways whose nodes are not in the diff from the OSM API"
+    )
+    args = parser.parse_args()
+    
+    if args.sequence is not None and len(args.paths) != 1:
+        parser.error("--sequence can only be used with a single change file")
+    
+    apply_changes(
+        args.paths, batch_size=args.batch_size, sequence=args.sequence,
+        fetch_missing_geometry=args.fetch_missing_geometry
+    )
+
+
+if __name__ == "__main__":
+    main()
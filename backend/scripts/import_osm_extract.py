@@ -0,0 +1,246 @@
+"""
+Import accommodations from a local OpenStreetMap extract into PostGIS
+
+Reads a .osm.pbf (needs the optional `osmium` package) or .osm/.osm.xml file (optionally
+.gz/.bz2 compressed), keeps the elements matching the tag mapping used by /osm/search and
+bulk-upserts them into the osm_accommodations table.
+
+Usage (from the backend directory):
+    python -m scripts.import_osm_extract path/to/region.osm.pbf [--truncate] [--batch-size 5000]
+
+Set OSM_SEARCH_SOURCE=local afterwards to serve /osm/search from the imported table.
+"""
+import argparse
+import bz2
+import gzip
+import logging
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from models.database import engine
+from models.osm_accommodation import OsmAccommodation, OsmReplicationState
+from utils.overpass import classify_accommodation, matching_accommodation_types
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPSERT_COLUMNS = ["name", "acc_type", "accommodation_types", "tags", "location"]
+
+
+def element_center(element: Dict[str, Any]):
+    """Return (lat, lon) for a node or the bounding-box center of a way/relation"""
+    if element["type"] == "node":
+        return element.get("lat"), element.get("lon")
+    center = element.get("center") or {}
+    return center.get("lat"), center.get("lon")
+
+
+def element_to_row(element: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Convert an OSM element dict (Overpass JSON shape) to an osm_accommodations row,
+    or None if it is not an accommodation or has no position
+    """
+    tags = element.get("tags") or {}
+    accommodation_types = matching_accommodation_types(tags)
+    if not accommodation_types:
+        return None
+    lat, lon = element_center(element)
+    if lat is None or lon is None:
+        return None
+    return {
+        "osm_type": element["type"],
+        "osm_id": element["id"],
+        "name": tags.get("name"),
+        "acc_type": classify_accommodation(tags),
+        "accommodation_types": accommodation_types,
+        "tags": tags,
+        "location": f"SRID=4326;POINT({lon} {lat})",
+    }
+
+
+def bbox_center(coords: List[tuple]) -> Optional[Dict[str, float]]:
+    """Center of the bounding box of (lat, lon) pairs, matching Overpass `out center`"""
+    if not coords:
+        return None
+    lats = [c[0] for c in coords]
+    lons = [c[1] for c in coords]
+    return {"lat": (min(lats) + max(lats)) / 2, "lon": (min(lons) + max(lons)) / 2}
+
+
+def open_extract(path: str):
+    """Open an OSM XML file, transparently decompressing .gz/.bz2"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def iter_xml_elements(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream accommodation nodes and ways from an OSM XML file.
+    
+    Every node position is kept in memory so way centers can be computed, which is fine for
+    city/state extracts; use a .pbf (handled by osmium with an on-disk index) for countries.
+    Relations are skipped because their geometry needs member ways that are not retained.
+    """
+    node_coords: Dict[int, tuple] = {}
+    with open_extract(path) as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event != "end" or elem.tag not in ("node", "way", "relation"):
+                continue
+            tags = {tag.get("k"): tag.get("v") for tag in elem.iter("tag")}
+            osm_id = int(elem.get("id"))
+            if elem.tag == "node":
+                lat, lon = float(elem.get("lat")), float(elem.get("lon"))
+                node_coords[osm_id] = (lat, lon)
+                if tags:
+                    yield {"type": "node", "id": osm_id, "lat": lat, "lon": lon, "tags": tags}
+            elif elem.tag == "way" and tags:
+                coords = [node_coords[ref] for ref in (int(nd.get("ref")) for nd in elem.iter("nd")) if ref in node_coords]
+                yield {"type": "way", "id": osm_id, "center": bbox_center(coords), "tags": tags}
+            root.clear()
+
+
+def iter_pbf_elements(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream accommodation nodes and ways from a .osm.pbf file using pyosmium
+    """
+    try:
+        import osmium
+    except ImportError:
+        raise SystemExit("Reading .pbf extracts requires the 'osmium' package (pip install osmium)")
+    
+    pending: List[Dict[str, Any]] = []
+    
+    class AccommodationHandler(osmium.SimpleHandler):
+        def node(self, n):
+            if len(n.tags) and matching_accommodation_types(n.tags):
+                pending.append({
+                    "type": "node", "id": n.id,
+                    "lat": n.location.lat, "lon": n.location.lon,
+                    "tags": {t.k: t.v for t in n.tags}
+                })
+        
+        def way(self, w):
+            if len(w.tags) and matching_accommodation_types(w.tags):
+                coords = [(nd.lat, nd.lon) for nd in w.nodes if nd.location.valid()]
+                pending.append({
+                    "type": "way", "id": w.id, "center": bbox_center(coords),
+                    "tags": {t.k: t.v for t in w.tags}
+                })
+    
+    # The handler only collects matches, so the buffered list stays small
+    AccommodationHandler().apply_file(path, locations=True, idx="flex_mem")
+    yield from pending
+
+
+def iter_extract_elements(path: str) -> Iterator[Dict[str, Any]]:
+    """Pick the parser from the file extension"""
+    if path.endswith(".pbf"):
+        return iter_pbf_elements(path)
+    return iter_xml_elements(path)
+
+
+def upsert_rows(connection, rows: List[Dict[str, Any]]) -> None:
+    """Insert or update a batch of rows keyed on (osm_type, osm_id)"""
+    if not rows:
+        return
+    stmt = insert(OsmAccommodation.__table__).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["osm_type", "osm_id"],
+        set_={**{col: stmt.excluded[col] for col in UPSERT_COLUMNS}, "updated_at": func.now()}
+    )
+    connection.execute(stmt)
+
+
+def delete_rows(connection, keys: List[tuple]) -> int:
+    """Delete a batch of (osm_type, osm_id) keys; returns how many rows were removed"""
+    if not keys:
+        return 0
+    return connection.execute(
+        delete(OsmAccommodation.__table__).where(
+            tuple_(OsmAccommodation.osm_type, OsmAccommodation.osm_id).in_(keys)
+        )
+    ).rowcount
+
+
+def get_sequence_number(connection) -> Optional[int]:
+    """Return the last replication sequence applied to osm_accommodations"""
+    return connection.execute(
+        select(OsmReplicationState.sequence_number)
+        .where(OsmReplicationState.table_name == OsmAccommodation.__tablename__)
+    ).scalar()
+
+
+def set_sequence_number(connection, sequence_number: int) -> None:
+    """Record the replication sequence the table is now up to date with"""
+    stmt = insert(OsmReplicationState.__table__).values(
+        table_name=OsmAccommodation.__tablename__,
+        sequence_number=sequence_number
+    )
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=["table_name"],
+        set_={"sequence_number": stmt.excluded.sequence_number, "updated_at": func.now()}
+    ))
+
+
+def import_extract(
+    path: str,
+    batch_size: int = 5000,
+    truncate: bool = False,
+    sequence_number: Optional[int] = None
+) -> int:
+    """
+    Load all accommodations from an extract. Returns the number of rows written.
+    """
+    started = time.time()
+    written = 0
+    with engine.begin() as connection:
+        if truncate:
+            connection.execute(OsmAccommodation.__table__.delete())
+        
+        batch: Dict[tuple, Dict[str, Any]] = {}
+        for element in iter_extract_elements(path):
+            row = element_to_row(element)
+            if row is None:
+                continue
+            # Keyed so a batch never contains the same element twice (ON CONFLICT would reject it)
+            batch[(row["osm_type"], row["osm_id"])] = row
+            if len(batch) >= batch_size:
+                upsert_rows(connection, list(batch.values()))
+                written += len(batch)
+                batch = {}
+                logger.info(f"Imported {written} accommodations")
+        upsert_rows(connection, list(batch.values()))
+        written += len(batch)
+        
+        if sequence_number is not None:
+            set_sequence_number(connection, sequence_number)
+    
+    logger.info(f"Imported {written} accommodations from {path} in {time.time() - started:.1f}s")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import accommodations from an OSM extract into PostGIS")
+    parser.add_argument("path", help="Path to a .osm.pbf, .osm or .osm.xml(.gz/.bz2) extract")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per INSERT statement")
+    parser.add_argument("--truncate", action="store_true", help="Empty the table before importing")
+    parser.add_argument(
+        "--sequence", type=int, default=None,
+        help="Replication sequence number the extract corresponds to (enables apply_osm_changes)"
+    )
+    args = parser.parse_args()
+    
+    import_extract(args.path, batch_size=args.batch_size, truncate=args.truncate, sequence_number=args.sequence)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Recompute the materialized property x college distances
+
+Loads every property and college coordinate, computes all pairs within
+COLLEGE_DISTANCE_MAX_KM with the vectorized haversine kernel (one college at a time,
+bounding-box prefiltered) and replaces the rows of property_college_distances.
+
+Usage (from the backend directory):
+    python -m scripts.refresh_college_distances [--college-id 3 --college-id 7] [--batch-size 10000]
+
+Property and College inserts/updates made through the ORM keep their own rows fresh; run it
+after bulk loads or after changing COLLEGE_DISTANCE_MAX_KM.
+"""
+import argparse
+import logging
+import time
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from models.college import College, PropertyCollegeDistance, iter_college_distance_rows, point_coordinates
+from models.database import engine
+from models.property import Property
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_points(connection, table, ids: Optional[List[int]] = None):
+    """(ids, latitudes, longitudes) arrays for the rows of a table with a POINT location"""
+    query = select(table.c.id, *point_coordinates(table.c.location))
+    if ids:
+        query = query.where(table.c.id.in_(ids))
+    rows = connection.execute(query).all()
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+    point_ids, latitudes, longitudes = zip(*rows)
+    return np.array(point_ids, dtype=np.int64), np.array(latitudes, dtype=np.float64), np.array(longitudes, dtype=np.float64)
+
+
+def refresh_college_distances(college_ids: Optional[List[int]] = None, batch_size: int = 10000) -> int:
+    """Replace the distance rows of the given colleges (all when None); returns rows written"""
+    started = time.monotonic()
+    distances = PropertyCollegeDistance.__table__
+    written = 0
+    
+    with engine.begin() as connection:
+        property_ids, latitudes, longitudes = load_points(connection, Property.__table__)
+        colleges = load_points(connection, College.__table__, college_ids)
+        logger.info(f"Computing distances for {len(property_ids)} properties x {len(colleges[0])} colleges")
+        
+        stmt = delete(distances)
+        if college_ids:
+            stmt = stmt.where(distances.c.college_id.in_(college_ids))
+        connection.execute(stmt)
+        
+        batch = []
+        for row in iter_college_distance_rows(property_ids, latitudes, longitudes, *(c.tolist() for c in colleges)):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                connection.execute(insert(distances), batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            connection.execute(insert(distances), batch)
+            written += len(batch)
+    
+    logger.info(f"Wrote {written} distance rows in {time.monotonic() - started:.1f}s")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute property_college_distances")
+    parser.add_argument(
+        "--college-id", type=int, action="append", dest="college_ids",
+        help="Only refresh this college (repeatable); default refreshes all"
+    )
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per INSERT statement")
+    args = parser.parse_args()
+    
+    refresh_college_distances(args.college_ids, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Tests for the TTL/LRU cache
+"""
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", fake)
+    return fake
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+
+    clock.now += 59.9
+    assert cache.get("a") == 1
+
+    clock.now += 0.1
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("short", 1, ttl=5)
+    cache.set("long", 2)
+
+    clock.now += 10
+    assert cache.get("short", None) is None
+    assert cache.get("long") == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_overwriting_refreshes_expiry_and_recency(clock):
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    clock.now += 50
+    cache.set("a", 10)
+    cache.set("c", 3)  # Evicts "b", not the rewritten "a"
+
+    clock.now += 20
+    assert cache.get("a") == 10
+    assert cache.get("b") is MISSING
+
+
+def test_save_and_load_skip_expired_entries(clock, tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("fresh", {"results": [1, 2]})
+    cache.set("stale", [], ttl=1)
+    clock.now += 2
+    cache.save(path)
+
+    restored = TTLCache(maxsize=10, ttl=60)
+    assert restored.load(path) == 1
+    assert restored.get("fresh") == {"results": [1, 2]}
+    assert restored.get("stale") is MISSING
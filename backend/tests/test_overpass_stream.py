@@ -0,0 +1,87 @@
+"""
+Tests for the incremental Overpass response parser
+"""
+import asyncio
+import json
+
+import pytest
+
+from utils.overpass import OverpassStreamParser, aiter_elements
+
+ELEMENTS = [
+    {"type": "node", "id": 1, "lat": 28.75, "lon": 77.49, "tags": {"tourism": "hostel", "name": "Zoë's Hostel"}},
+    {"type": "way", "id": 2, "center": {"lat": 28.76, "lon": 77.5}, "tags": {"building": "dormitory", "name": "छात्रावास"}},
+    {"type": "node", "id": 3, "lat": 28.77, "lon": 77.51, "tags": {"note": "brackets ] and } in a \"string\""}},
+]
+
+PAYLOAD = json.dumps({
+    "version": 0.6,
+    "osm3s": {"copyright": "OpenStreetMap"},
+    "elements": ELEMENTS,
+}, ensure_ascii=False, indent=1).encode()
+
+
+def parse(payload: bytes, chunk_size: int) -> list:
+    parser = OverpassStreamParser()
+    elements = []
+    for start in range(0, len(payload), chunk_size):
+        elements.extend(parser.feed(payload[start:start + chunk_size]))
+    elements.extend(parser.close())
+    return elements
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, len(PAYLOAD)])
+def test_chunk_boundaries(chunk_size):
+    # Splits land inside multi-byte characters, strings and between elements
+    assert parse(PAYLOAD, chunk_size) == ELEMENTS
+
+
+def test_empty_elements_array():
+    assert parse(b'{"version": 0.6, "elements": []}', 4) == []
+
+
+def test_remark_is_kept():
+    payload = json.dumps({
+        "elements": ELEMENTS[:1],
+        "remark": "runtime error: Query timed out in \"query\" at line 3 after 26 seconds.",
+    }).encode()
+    parser = OverpassStreamParser()
+    elements = []
+    for start in range(0, len(payload), 3):
+        elements.extend(parser.feed(payload[start:start + 3]))
+    elements.extend(parser.close())
+    assert elements == ELEMENTS[:1]
+    assert parser.remark.startswith('runtime error: Query timed out in "query"')
+
+
+def test_aiter_elements_raises_on_remark():
+    payload = json.dumps({"elements": ELEMENTS[:1], "remark": "runtime error: out of memory"}).encode()
+
+    async def chunks():
+        yield payload
+
+    async def collect():
+        return [element async for element in aiter_elements(chunks())]
+
+    with pytest.raises(ValueError, match="out of memory"):
+        asyncio.run(collect())
+
+
+@pytest.mark.parametrize("payload", [
+    b"",
+    b"<html><body>429 Too Many Requests</body></html>",
+    b'{"version": 0.6, "osm3s": {}}',
+])
+def test_body_without_elements_raises(payload):
+    parser = OverpassStreamParser()
+    assert parser.feed(payload) == []
+    with pytest.raises(ValueError, match="no elements array"):
+        parser.close()
+
+
+def test_truncated_payload_raises():
+    cut = PAYLOAD.index(b'"id": 3')
+    parser = OverpassStreamParser()
+    assert parser.feed(PAYLOAD[:cut]) == ELEMENTS[:2]
+    with pytest.raises(ValueError, match="ended inside the elements array"):
+        parser.close()
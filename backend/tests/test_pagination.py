@@ -0,0 +1,39 @@
+"""
+Tests for keyset pagination cursors
+"""
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from utils.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+@pytest.mark.parametrize("values", [(1250.5, 42), (0, 1), (-3.25e-7, 9007199254740991)])
+def test_round_trip(values):
+    assert decode_cursor(encode_cursor(*values), len(values)) == list(values)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64 at all!",
+    raw_cursor("not json"),
+    raw_cursor(json.dumps({"price": 1, "id": 2})),
+    raw_cursor(json.dumps(1.5)),
+    raw_cursor(json.dumps([1.5])),
+    raw_cursor(json.dumps([1.5, 2, 3])),
+    raw_cursor(json.dumps(["1.5", 2])),
+    raw_cursor(json.dumps([1.5, None])),
+    raw_cursor(json.dumps([True, 2])),
+    raw_cursor(json.dumps([[1.5], 2])),
+    base64.urlsafe_b64encode(b"\xff\xfe[1,2]").decode(),
+])
+def test_rejects_bad_input(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor, 2)
+    assert excinfo.value.status_code == 400
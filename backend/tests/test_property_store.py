@@ -0,0 +1,88 @@
+"""
+Tests for the columnar property store against plain-Python reference results
+"""
+import random
+
+import numpy as np
+import pytest
+
+from utils.property_store import PropertyStore
+
+
+def make_records(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    records = []
+    for property_id in rng.sample(range(1, count * 10), count):
+        records.append({
+            "id": property_id,
+            # Few distinct prices so ties on price exercise the id tie-break
+            "price": rng.choice([None, 4000.0, 4500.0, 5000.0, 6000.0, 6000.0, 7500.0]),
+            "city": rng.choice(["Delhi", "Ghaziabad", "Noida"]),
+            "is_available": rng.random() < 0.8,
+            "has_wifi": rng.random() < 0.5,
+        })
+    return records
+
+
+def sort_key(record: dict) -> tuple:
+    price = record["price"]
+    return (float("inf") if price is None else price, record["id"])
+
+
+def brute_force(records: list, mask: np.ndarray, after=None, skip: int = 0, limit: int = 100):
+    rows = sorted((r for r, keep in zip(records, mask) if keep), key=sort_key)
+    if after is not None:
+        rows = [r for r in rows if sort_key(r) > tuple(after)]
+        skip = 0
+    return rows[skip:skip + limit], skip + limit < len(rows)
+
+
+@pytest.fixture
+def records():
+    return make_records(500)
+
+
+@pytest.mark.parametrize("skip, limit", [(0, 1), (0, 10), (7, 25), (490, 20), (0, 1000), (600, 10)])
+def test_page_by_price_matches_sorting(records, skip, limit):
+    store = PropertyStore(records)
+    mask = store.match(is_available=True)
+    assert store.page_by_price(mask, skip=skip, limit=limit) == brute_force(records, mask, skip=skip, limit=limit)
+
+
+def test_page_by_price_with_filters(records):
+    store = PropertyStore(records)
+    mask = store.match(city="ghazi", max_price=6000)
+    expected = brute_force(records, mask, limit=15)
+    assert all(r["city"] == "Ghaziabad" and r["price"] <= 6000 for r in expected[0])
+    assert store.page_by_price(mask, limit=15) == expected
+
+
+def test_cursor_walk_visits_every_match_once(records):
+    store = PropertyStore(records)
+    mask = store.match(is_available=True)
+    expected, _ = brute_force(records, mask, limit=len(records))
+
+    # Missing prices sort last; the cursor walk stops there like the API, whose
+    # cursor is built from the last row's price
+    priced = [r for r in expected if r["price"] is not None]
+    seen, after = [], None
+    while True:
+        page, has_more = store.page_by_price(mask, after=after, limit=13)
+        page = [r for r in page if r["price"] is not None]
+        seen.extend(page)
+        if not has_more or not page:
+            break
+        after = (page[-1]["price"], page[-1]["id"])
+    assert [r["id"] for r in seen] == [r["id"] for r in priced]
+
+
+def test_rebuild_after_invalidate(records):
+    store = PropertyStore(records)
+    mask = store.match(is_available=True)
+    store.page_by_price(mask, limit=5)
+
+    cheapest = {"id": 0, "price": 1.0, "city": "Delhi", "is_available": True}
+    records.append(cheapest)
+    store.invalidate()
+    page, _ = store.page_by_price(store.match(is_available=True), limit=1)
+    assert page == [cheapest]
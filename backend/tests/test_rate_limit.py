@@ -0,0 +1,79 @@
+"""
+Tests for the async token bucket
+"""
+import asyncio
+
+import pytest
+
+from utils import rate_limit as rate_limit_module
+from utils.rate_limit import AsyncTokenBucket
+
+
+class FakeClock:
+    """Stands in for time.time and asyncio.sleep; sleeping advances the clock unless frozen"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.frozen = False
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        if not self.frozen:
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit_module.time, "time", fake.time)
+    monkeypatch.setattr(rate_limit_module.asyncio, "sleep", fake.sleep)
+    return fake
+
+
+def acquire_many(bucket: AsyncTokenBucket, count: int) -> list:
+    async def run():
+        return [await bucket.acquire() for _ in range(count)]
+    return asyncio.run(run())
+
+
+def test_sequential_calls_are_spaced_by_rate(clock):
+    bucket = AsyncTokenBucket(rate=2.0, capacity=1.0)
+    assert acquire_many(bucket, 4) == pytest.approx([0.0, 0.5, 0.5, 0.5])
+
+
+def test_burst_up_to_capacity_then_spaced(clock):
+    bucket = AsyncTokenBucket(rate=1.0, capacity=3.0)
+    assert acquire_many(bucket, 5) == pytest.approx([0.0, 0.0, 0.0, 1.0, 1.0])
+
+
+def test_idle_time_refills_without_exceeding_capacity(clock):
+    bucket = AsyncTokenBucket(rate=1.0, capacity=2.0)
+    acquire_many(bucket, 2)
+    clock.now += 100
+    assert acquire_many(bucket, 3) == pytest.approx([0.0, 0.0, 1.0])
+
+
+def test_concurrent_callers_queue_in_order(clock):
+    bucket = AsyncTokenBucket(rate=4.0, capacity=1.0)
+    # All callers arrive at the same instant and are still waiting when the next reserves
+    clock.frozen = True
+
+    async def run():
+        return await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+
+    # Each reservation queues behind the previous ones, so waits grow by 1/rate
+    assert asyncio.run(run()) == pytest.approx([0.0, 0.25, 0.5, 0.75])
+
+
+@pytest.mark.skipif(rate_limit_module.fcntl is None, reason="needs fcntl")
+def test_buckets_sharing_a_state_file_share_the_budget(clock, tmp_path):
+    state_path = str(tmp_path / "bucket.json")
+    first = AsyncTokenBucket(rate=2.0, capacity=1.0, state_path=state_path)
+    second = AsyncTokenBucket(rate=2.0, capacity=1.0, state_path=state_path)
+
+    assert acquire_many(first, 1) == pytest.approx([0.0])
+    assert acquire_many(second, 1) == pytest.approx([0.5])
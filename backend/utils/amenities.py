@@ -0,0 +1,58 @@
+"""
+Amenity flags packed into a single integer bitmask
+"""
+from typing import Any, Dict, Optional, Tuple
+
+# Bit i of a mask is AMENITY_FIELDS[i]; the order is persisted in properties.amenity_mask,
+# so new amenities must only ever be appended
+AMENITY_FIELDS = (
+    "has_wifi", "has_ac", "has_parking", "has_tv", "has_kitchen", "has_washing_machine",
+    "has_gym", "has_study_room", "has_mess", "has_laundry", "has_hot_water",
+)
+
+AMENITY_BITS = {field: 1 << bit for bit, field in enumerate(AMENITY_FIELDS)}
+
+
+def amenity_mask(record: Any) -> int:
+    """
+    Pack the has_* flags of a property dict or model instance into an int
+    """
+    if isinstance(record, dict):
+        flag = record.get
+    else:
+        flag = lambda field: getattr(record, field, None)
+    mask = 0
+    for field, bit in AMENITY_BITS.items():
+        if flag(field):
+            mask |= bit
+    return mask
+
+
+def amenity_filter_masks(flags: Dict[str, Optional[bool]], allow_forbidden: bool = True) -> Tuple[int, int]:
+    """
+    Turn has_* query filters into (required, forbidden) masks
+
+    True requires the amenity, False forbids it (only when allow_forbidden, otherwise it
+    is ignored like None).
+    """
+    required = forbidden = 0
+    for field, wanted in flags.items():
+        if wanted:
+            required |= AMENITY_BITS[field]
+        elif wanted is not None and allow_forbidden:
+            forbidden |= AMENITY_BITS[field]
+    return required, forbidden
+
+
+def matches_amenities(mask: int, required: int, forbidden: int = 0) -> bool:
+    """
+    Single test for any combination of required and forbidden amenities
+    """
+    return mask & (required | forbidden) == required
+
+
+def amenity_mask_clause(column, required: int, forbidden: int = 0):
+    """
+    SQL equivalent of matches_amenities for an integer mask column
+    """
+    return column.op("&")(required | forbidden) == required
@@ -0,0 +1,134 @@
+"""
+Geographic distance helpers
+
+Scalar haversine for single points, plus NumPy kernels for one-to-many and many-to-many
+distances with bounding-box prefiltering.
+"""
+from math import radians, degrees, cos, sin, asin, sqrt
+from typing import Tuple
+
+import numpy as np
+
+# Mean radius of the earth in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance in kilometers between two points given in decimal degrees
+    """
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    return 2 * asin(sqrt(a)) * EARTH_RADIUS_KM
+
+
+def haversine_km_many(latitude: float, longitude: float, latitudes, longitudes) -> np.ndarray:
+    """
+    Distances in kilometers from one point to arrays of points, vectorized
+    """
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(longitudes, dtype=np.float64)) - np.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def pairwise_haversine_km(latitudes1, longitudes1, latitudes2, longitudes2) -> np.ndarray:
+    """
+    Many-to-many distance matrix in kilometers, shape (len(points1), len(points2))
+
+    Used for batch jobs such as properties x colleges; memory is O(n * m), so callers
+    should chunk very large inputs.
+    """
+    lat1 = np.radians(np.asarray(latitudes1, dtype=np.float64))[:, np.newaxis]
+    lon1 = np.radians(np.asarray(longitudes1, dtype=np.float64))[:, np.newaxis]
+    lat2 = np.radians(np.asarray(latitudes2, dtype=np.float64))[np.newaxis, :]
+    lon2 = np.radians(np.asarray(longitudes2, dtype=np.float64))[np.newaxis, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    (min_lat, max_lat, min_lon, max_lon) enclosing the circle of radius_km
+
+    Longitudes are not wrapped, so the box may extend past +/-180 near the antimeridian;
+    when it reaches a pole it spans every longitude (-180, 180).
+    """
+    angular_radius = radius_km / EARTH_RADIUS_KM
+    lat_span = degrees(angular_radius)
+    min_lat = max(-90.0, latitude - lat_span)
+    max_lat = min(90.0, latitude + lat_span)
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return min_lat, max_lat, -180.0, 180.0
+
+    # Widest longitude offset of the circle (at the tangent latitude)
+    ratio = sin(angular_radius) / cos(radians(latitude))
+    if ratio >= 1.0:
+        return min_lat, max_lat, -180.0, 180.0
+    lon_span = degrees(asin(ratio))
+    return min_lat, max_lat, longitude - lon_span, longitude + lon_span
+
+
+def bounding_box_mask(latitudes, longitudes, box: Tuple[float, float, float, float]) -> np.ndarray:
+    """
+    Boolean mask of points inside a bounding_box, handling antimeridian wrap-around
+    """
+    min_lat, max_lat, min_lon, max_lon = box
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    return (
+        (latitudes >= min_lat) & (latitudes <= max_lat)
+        & (np.mod(longitudes - min_lon, 360.0) <= max_lon - min_lon)
+    )
+
+
+def within_radius(latitude: float, longitude: float, radius_km: float, latitudes, longitudes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and distances (km) of the points within radius_km, nearest first
+
+    The bounding box discards far points before any trigonometry is evaluated.
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    candidates = np.flatnonzero(bounding_box_mask(latitudes, longitudes, bounding_box(latitude, longitude, radius_km)))
+    distances = haversine_km_many(latitude, longitude, latitudes[candidates], longitudes[candidates])
+    inside = distances <= radius_km
+    candidates, distances = candidates[inside], distances[inside]
+    order = np.argsort(distances, kind="stable")
+    return candidates[order], distances[order]
+
+
+# Geohash alphabet (base32 without a, i, l, o)
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 8) -> str:
+    """
+    Geohash of a point; precision 8 is a cell of roughly 38 m x 19 m
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # Bits alternate longitude, latitude, starting with longitude
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
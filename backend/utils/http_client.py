@@ -0,0 +1,51 @@
+"""
+Shared async HTTP client for outbound calls to external APIs
+"""
+from typing import Optional
+
+import httpx
+
+from config import settings
+
+# Custom user agent as required by OSM API usage policy
+DEFAULT_HEADERS = {"User-Agent": "PG-Flat-Finder/1.0"}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """
+    Create the pooled client (called once from the application startup event)
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client, creating it lazily if startup has not run (e.g. in scripts)
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(headers=DEFAULT_HEADERS, timeout=settings.HTTP_TIMEOUT_SECONDS)
+    return _client
+
+
+async def close_http_client() -> None:
+    """
+    Close the pooled client and its keep-alive connections (called on shutdown)
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,115 @@
+"""
+Precomputed nearby lists for registered campuses and landmarks
+"""
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from utils.geo import geohash_encode, haversine_km
+from utils.spatial_index import GridIndex
+
+
+class _Landmark:
+    """Sorted (distance, key) entries of every point within the cache radius"""
+    
+    def __init__(self, name: str, latitude: float, longitude: float):
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.entries: List[Tuple[float, Hashable]] = []
+        self.distances: List[float] = []  # entries[i][0], kept for bisect by radius
+        self.distance_by_key: Dict[Hashable, float] = {}
+    
+    def clear(self) -> None:
+        self.entries.clear()
+        self.distances.clear()
+        self.distance_by_key.clear()
+    
+    def add(self, distance: float, key: Hashable) -> None:
+        position = bisect_left(self.entries, (distance, key))
+        self.entries.insert(position, (distance, key))
+        self.distances.insert(position, distance)
+        self.distance_by_key[key] = distance
+    
+    def discard(self, key: Hashable) -> None:
+        distance = self.distance_by_key.pop(key, None)
+        if distance is None:
+            return
+        position = bisect_left(self.entries, (distance, key))
+        del self.entries[position]
+        del self.distances[position]
+
+
+class NearbyCache:
+    """
+    Per registered point, the points of a GridIndex within max_radius_km sorted by distance
+
+    A query centred in the same geohash cell as a registered point (about 38 m x 19 m at
+    precision 8) is answered by slicing that list at the requested radius; distances are
+    measured from the registered coordinates. Writes must be mirrored with update_point
+    and remove_point so the lists stay fresh.
+    """
+    
+    def __init__(self, index: GridIndex, max_radius_km: float = 10.0, precision: int = 8):
+        self.index = index
+        self.max_radius_km = max_radius_km
+        self.precision = precision
+        self._landmarks: Dict[str, _Landmark] = {}
+        self._items: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def register(self, name: str, latitude: float, longitude: float) -> None:
+        """Add a campus/landmark and precompute its list from the index"""
+        landmark = _Landmark(name, latitude, longitude)
+        self._landmarks[geohash_encode(latitude, longitude, self.precision)] = landmark
+        self._fill(landmark)
+    
+    def _fill(self, landmark: _Landmark) -> None:
+        landmark.clear()
+        for distance, key, item in self.index.query_radius(landmark.latitude, landmark.longitude, self.max_radius_km):
+            landmark.add(distance, key)
+            self._items[key] = item
+    
+    def refresh(self) -> None:
+        """Recompute every list from the index (e.g. after a bulk load)"""
+        self._items.clear()
+        for landmark in self._landmarks.values():
+            self._fill(landmark)
+    
+    def update_point(self, key: Hashable, latitude: float, longitude: float, item: Any = None) -> None:
+        """Insert or move a point in every list it now belongs to"""
+        self._items.pop(key, None)
+        for landmark in self._landmarks.values():
+            landmark.discard(key)
+            distance = haversine_km(landmark.latitude, landmark.longitude, latitude, longitude)
+            if distance <= self.max_radius_km:
+                landmark.add(distance, key)
+                self._items[key] = item
+    
+    def remove_point(self, key: Hashable) -> None:
+        """Drop a point from every list"""
+        self._items.pop(key, None)
+        for landmark in self._landmarks.values():
+            landmark.discard(key)
+    
+    def lookup(self, latitude: float, longitude: float, radius_km: float) -> Optional[List[Tuple[float, Hashable, Any]]]:
+        """
+        (distance_km, key, item) within radius_km, nearest first, or None when the point
+        is not registered or the radius exceeds the precomputed one
+        """
+        landmark = None
+        if radius_km <= self.max_radius_km:
+            landmark = self._landmarks.get(geohash_encode(latitude, longitude, self.precision))
+        if landmark is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        end = bisect_right(landmark.distances, radius_km)
+        return [(distance, key, self._items[key]) for distance, key in landmark.entries[:end]]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "landmarks": {landmark.name: len(landmark.entries) for landmark in self._landmarks.values()},
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,251 @@
+"""
+Overpass QL query compiler and OSM element conversion for accommodation search
+"""
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional
+
+# Map our accommodation types to OSM tags
+TAG_MAPPING = {
+    "hostel": ["tourism=hostel"],
+    "dormitory": ["amenity=dormitory", "building=dormitory"],
+    "apartments": ["building=apartments"],
+    "flat": ["building=residential", "residential=apartment"],
+    "pg": ["leisure=lodging", "amenity=lodging", "tourism=guest_house"],
+    "hotel": ["tourism=hotel"],
+    "guest_house": ["tourism=guest_house"]
+}
+
+
+def group_tags_by_key(accommodation_types: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Collect the OSM tag values needed for the selected types, grouped by tag key
+    """
+    grouped: Dict[str, set] = {}
+    for acc_type in accommodation_types:
+        for tag in TAG_MAPPING.get(acc_type, []):
+            key, value = tag.split("=")
+            grouped.setdefault(key, set()).add(value)
+    return {key: sorted(values) for key, values in sorted(grouped.items())}
+
+
+def build_overpass_query(
+    lat: float,
+    lon: float,
+    radius_m: int,
+    accommodation_types: Iterable[str],
+    timeout: int = 25
+) -> Optional[str]:
+    """
+    Compile a single-pass Overpass QL query for the selected accommodation types.
+    
+    Emits one nwr statement per tag key, with the values of that key folded into an
+    anchored regex union, e.g. nwr["tourism"~"^(guest_house|hostel|hotel)$"]. Nodes are
+    printed with their coordinates and ways/relations with tags plus a center point only,
+    so each element is returned exactly once. Returns None if no type maps to any tag.
+    """
+    around = f"(around:{radius_m},{lat},{lon})"
+    statements = []
+    for key, values in group_tags_by_key(accommodation_types).items():
+        if len(values) == 1:
+            statements.append(f'nwr["{key}"="{values[0]}"]{around};')
+        else:
+            union = "|".join(re.escape(value) for value in values)
+            statements.append(f'nwr["{key}"~"^({union})$"]{around};')
+    
+    if not statements:
+        return None
+    
+    return (
+        f"[out:json][timeout:{timeout}];\n"
+        f"({' '.join(statements)})->.acc;\n"
+        "node.acc;\n"
+        "out body;\n"
+        "(way.acc; relation.acc;);\n"
+        "out tags center;"
+    )
+
+
+def matching_accommodation_types(tags: Dict[str, str]) -> List[str]:
+    """
+    Return every accommodation type in TAG_MAPPING whose tags match the element
+    """
+    return [
+        acc_type for acc_type, type_tags in TAG_MAPPING.items()
+        if any(tags.get(tag.split("=")[0]) == tag.split("=")[1] for tag in type_tags)
+    ]
+
+
+def classify_accommodation(tags: Dict[str, str]) -> str:
+    """
+    Determine our accommodation type from an element's OSM tags
+    """
+    if tags.get("tourism") in ["hostel", "hotel", "guest_house"]:
+        return tags.get("tourism")
+    elif tags.get("amenity") in ["dormitory", "lodging"]:
+        return tags.get("amenity")
+    elif tags.get("building") in ["apartments", "dormitory", "residential"]:
+        return tags.get("building")
+    elif tags.get("residential") == "apartment":
+        return "flat"
+    return "accommodation"
+
+
+def element_to_result(element: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Convert an Overpass element to a search result, or None if it has no coordinates
+    """
+    element_type = element.get("type")
+    tags = element.get("tags", {})
+    
+    # Get coordinates based on element type
+    if element_type == "node":
+        element_lat = element.get("lat")
+        element_lon = element.get("lon")
+    else:
+        # For ways and relations, use the center point
+        center = element.get("center", {})
+        element_lat = center.get("lat")
+        element_lon = center.get("lon")
+        
+    # Skip elements without coordinates
+    if not element_lat or not element_lon:
+        return None
+        
+    acc_type = classify_accommodation(tags)
+        
+    # Create result object with all available details
+    return {
+        "id": element.get("id"),
+        "osm_type": element_type,
+        "name": tags.get("name", f"Unnamed {acc_type.title()}"),
+        "type": acc_type,
+        "latitude": element_lat,
+        "longitude": element_lon,
+        "address": {
+            "street": tags.get("addr:street"),
+            "housenumber": tags.get("addr:housenumber"),
+            "city": tags.get("addr:city"),
+            "state": tags.get("addr:state"),
+            "postcode": tags.get("addr:postcode"),
+            "country": tags.get("addr:country")
+        },
+        "contact": {
+            "phone": tags.get("phone"),
+            "website": tags.get("website"),
+            "email": tags.get("email")
+        },
+        "amenities": {
+            "internet": tags.get("internet") == "yes" or tags.get("wifi") == "yes",
+            "wheelchair": tags.get("wheelchair") == "yes",
+            "parking": tags.get("parking") == "yes"
+        },
+        "details": {
+            "rooms": tags.get("rooms"),
+            "stars": tags.get("stars"),
+            "description": tags.get("description")
+        },
+        "original_tags": tags  # Include all original tags for reference
+    }
+
+
+class OverpassStreamParser:
+    """
+    Incremental parser that pulls elements out of an Overpass JSON response as bytes arrive.
+    
+    Only the unparsed tail of the payload is buffered, so memory stays bounded by the chunk
+    size plus one element no matter how large the full response is. Any "remark" that
+    Overpass appends after the elements array (timeouts, memory errors) is kept in .remark.
+    """
+
+    _ELEMENTS_START = re.compile(r'"elements"\s*:\s*\[')
+    _REMARK = re.compile(r'"remark"\s*:\s*"((?:[^"\\]|\\.)*)"')
+    _WHITESPACE_AND_COMMAS = " \t\r\n,"
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "header"  # header -> elements -> trailer
+        self.remark: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Consume a chunk of bytes and return the elements completed by it"""
+        self._buffer += self._decoder.decode(chunk)
+        elements = []
+        
+        if self._state == "header":
+            match = self._ELEMENTS_START.search(self._buffer)
+            if match is None:
+                return elements
+            self._buffer = self._buffer[match.end():]
+            self._state = "elements"
+        
+        if self._state == "elements":
+            buffer = self._buffer
+            pos = 0
+            while True:
+                while pos < len(buffer) and buffer[pos] in self._WHITESPACE_AND_COMMAS:
+                    pos += 1
+                if pos >= len(buffer):
+                    break
+                if buffer[pos] == "]":
+                    pos += 1
+                    self._state = "trailer"
+                    break
+                try:
+                    element, pos = self._json.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Element is not complete yet; wait for more bytes
+                    break
+                elements.append(element)
+            self._buffer = buffer[pos:]
+        
+        if self._state == "trailer":
+            match = self._REMARK.search(self._buffer)
+            if match is not None:
+                self.remark = json.loads(f'"{match.group(1)}"')
+        
+        return elements
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Flush the decoder at end of stream; raises ValueError if the payload was truncated
+        or never contained an elements array (empty body, HTML error page)
+        """
+        elements = self.feed(self._decoder.decode(b"", final=True).encode())
+        if self._state == "header":
+            raise ValueError("Overpass response has no elements array")
+        if self._state == "elements":
+            raise ValueError("Overpass response ended inside the elements array")
+        return elements
+
+
+async def aiter_elements(chunks: AsyncIterable[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield Overpass elements from a streamed response body as soon as each one is complete
+    """
+    parser = OverpassStreamParser()
+    async for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+    for element in parser.close():
+        yield element
+    if parser.remark:
+        raise ValueError(f"Overpass reported: {parser.remark}")
+
+
+async def aiter_results(elements: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield one result per distinct (type, id) streamed element, skipping elements without coordinates
+    """
+    seen = set()
+    async for element in elements:
+        element_key = (element.get("type"), element.get("id"))
+        if element_key in seen:
+            continue
+        seen.add(element_key)
+        result = element_to_result(element)
+        if result is not None:
+            yield result
@@ -0,0 +1,58 @@
+"""
+Display normalization for property records
+"""
+from typing import Any, Dict, Iterable, List
+
+# Values used when a field is missing or None, merged into each record in one step
+DISPLAY_DEFAULTS: Dict[str, Any] = {
+    "latitude": 0.0,
+    "longitude": 0.0,
+    **dict.fromkeys((
+        "has_wifi", "has_ac", "has_parking", "has_tv", "has_kitchen",
+        "has_washing_machine", "has_gym", "has_study_room",
+        "has_mess", "has_laundry", "has_hot_water", "is_available"
+    ), False),
+    **dict.fromkeys((
+        "title", "description", "address", "city", "state", "zipcode",
+        "contact_name", "contact_phone", "contact_email", "main_image_url"
+    ), ""),
+    "price": 0,
+}
+
+# Fields rendered as ISO strings
+DATE_FIELDS = ("created_at", "updated_at", "available_from")
+
+
+def enhance_property(prop: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Complete a single property for display, returning a new dict (the input is untouched)
+    """
+    enhanced = {**DISPLAY_DEFAULTS, **prop}
+    
+    # Only records carrying explicit None values need the per-field pass
+    if None in enhanced.values():
+        for field, default in DISPLAY_DEFAULTS.items():
+            if enhanced[field] is None:
+                enhanced[field] = default
+    
+    if "bedrooms" not in enhanced and "room_type" not in enhanced:
+        enhanced["bedrooms"] = 1
+    if "bathrooms" not in enhanced:
+        enhanced["bathrooms"] = 1
+    
+    for field in DATE_FIELDS:
+        value = enhanced.get(field)
+        if value is not None and not isinstance(value, str):
+            try:
+                enhanced[field] = value.isoformat()
+            except AttributeError:
+                enhanced[field] = str(value)
+    
+    return enhanced
+
+
+def enhance_property_details(properties: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Ensures all properties have complete information for display
+    """
+    return [enhance_property(prop) for prop in properties]
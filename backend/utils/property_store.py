@@ -0,0 +1,199 @@
+"""
+Columnar in-memory property store
+
+Keeps the filterable fields of a list of property dicts in NumPy arrays so every filter
+of a listing request is evaluated as one vectorized boolean mask, and only the rows of
+the requested page are touched as dicts.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.amenities import amenity_mask
+
+# Enum-valued fields, stored as small int codes (-1 when missing)
+ENUM_FIELDS = ("property_type", "room_type", "gender", "food_facility")
+
+# Fields searched by the generic `location` filter
+LOCATION_FIELDS = ("address", "city", "state", "zipcode", "college_name")
+
+# Separator between fields in the combined location haystack (never typed in a search)
+FIELD_SEPARATOR = "\x00"
+
+
+def _enum_value(value: Any) -> Any:
+    """Enum members and their raw values share one code"""
+    return getattr(value, "value", value)
+
+
+class PropertyStore:
+    """
+    Column arrays over a shared list of property dicts, rebuilt lazily after writes
+    """
+    
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.records = records
+        self._dirty = True
+    
+    def invalidate(self) -> None:
+        """Mark the columns stale; call after records are added, removed or changed"""
+        self._dirty = True
+    
+    def _text_column(self, field: str, lower: bool = True) -> np.ndarray:
+        values = [str(r.get(field) or "") for r in self.records]
+        if lower:
+            values = [v.lower() for v in values]
+        return np.array(values, dtype=str)
+    
+    def _number_column(self, field: str, missing: float) -> np.ndarray:
+        return np.array(
+            [missing if r.get(field) is None else r[field] for r in self.records],
+            dtype=np.float64
+        )
+    
+    def _rebuild(self) -> None:
+        records = self.records
+        self.ids = np.array([r["id"] for r in records], dtype=np.int64)
+        self.price = self._number_column("price", np.nan)
+        self.latitude = self._number_column("latitude", np.nan)
+        self.longitude = self._number_column("longitude", np.nan)
+        self.bedrooms = self._number_column("bedrooms", np.nan)
+        self.bathrooms = self._number_column("bathrooms", np.nan)
+        self.college_distance_km = self._number_column("college_distance_km", np.inf)
+        self.is_available = np.array([bool(r.get("is_available", False)) for r in records], dtype=bool)
+        self.amenity_mask = np.array([amenity_mask(r) for r in records], dtype=np.int64)
+        
+        # Enum columns as int8 codes plus the value -> code lookup per field
+        self.enum_codes: Dict[str, Dict[Any, int]] = {}
+        self.enum_columns: Dict[str, np.ndarray] = {}
+        for field in ENUM_FIELDS:
+            codes: Dict[Any, int] = {}
+            column = np.full(len(records), -1, dtype=np.int8)
+            for row, record in enumerate(records):
+                value = record.get(field)
+                if value is not None:
+                    column[row] = codes.setdefault(_enum_value(value), len(codes))
+            self.enum_codes[field] = codes
+            self.enum_columns[field] = column
+        
+        # Lower-cased text columns for substring filters
+        self.city = self._text_column("city")
+        self.state = self._text_column("state")
+        self.zipcode = self._text_column("zipcode", lower=False)
+        self.college_name = self._text_column("college_name")
+        self.location_text = np.array(
+            [FIELD_SEPARATOR.join(str(r.get(f) or "") for f in LOCATION_FIELDS).lower() for r in records],
+            dtype=str
+        )
+        self._dirty = False
+    
+    def _ensure(self) -> None:
+        if self._dirty:
+            self._rebuild()
+    
+    def _enum_mask(self, field: str, values: Sequence[Any]) -> np.ndarray:
+        codes = self.enum_codes[field]
+        wanted = [codes[_enum_value(v)] for v in values if _enum_value(v) in codes]
+        return np.isin(self.enum_columns[field], wanted)
+    
+    @staticmethod
+    def _contains(column: np.ndarray, needle: str) -> np.ndarray:
+        return np.char.find(column, needle) >= 0
+    
+    def match(
+        self,
+        property_type: Any = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        bedrooms: Optional[int] = None,
+        bathrooms: Optional[int] = None,
+        location: Optional[str] = None,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        zipcode: Optional[str] = None,
+        is_available: Optional[bool] = None,
+        room_type: Any = None,
+        genders: Optional[Sequence[Any]] = None,
+        food_facility: Any = None,
+        college_name: Optional[str] = None,
+        max_college_distance: Optional[float] = None,
+        required_amenities: int = 0,
+    ) -> np.ndarray:
+        """
+        Boolean row mask for all given filters (None means "don't filter")
+        """
+        self._ensure()
+        mask = np.ones(len(self.records), dtype=bool)
+        
+        if property_type:
+            mask &= self._enum_mask("property_type", [property_type])
+        if min_price is not None:
+            mask &= self.price >= min_price
+        if max_price is not None:
+            mask &= self.price <= max_price
+        if bedrooms is not None:
+            mask &= self.bedrooms == bedrooms
+        if bathrooms is not None:
+            mask &= self.bathrooms == bathrooms
+        if location:
+            mask &= self._contains(self.location_text, location.lower())
+        if city:
+            mask &= self._contains(self.city, city.lower())
+        if state:
+            mask &= self._contains(self.state, state.lower())
+        if zipcode:
+            mask &= self._contains(self.zipcode, zipcode)
+        if is_available is not None:
+            mask &= self.is_available == is_available
+        if room_type:
+            mask &= self._enum_mask("room_type", [room_type])
+        if genders:
+            mask &= self._enum_mask("gender", genders)
+        if food_facility:
+            mask &= self._enum_mask("food_facility", [food_facility])
+        if college_name:
+            mask &= self._contains(self.college_name, college_name.lower())
+        if max_college_distance is not None:
+            mask &= self.college_distance_km <= max_college_distance
+        if required_amenities:
+            mask &= (self.amenity_mask & required_amenities) == required_amenities
+        
+        return mask
+    
+    def page_by_price(
+        self,
+        mask: np.ndarray,
+        after: Optional[Tuple[float, int]] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Records of one page ordered by (price, id), seeking past `after` or skipping `skip`
+
+        Returns the page records (the stored dicts, not copies) and whether more follow.
+        """
+        self._ensure()
+        if after is not None:
+            last_price, last_id = after
+            mask = mask & (
+                (self.price > last_price) | ((self.price == last_price) & (self.ids > last_id))
+            )
+            skip = 0
+        
+        rows = np.flatnonzero(mask)
+        # Missing prices sort last, like the float('inf') default of the list path
+        price = np.where(np.isnan(self.price[rows]), np.inf, self.price[rows])
+        
+        # Only the first skip+limit rows are ever returned: partition them out in O(n)
+        # and sort just those, instead of sorting every match
+        k = skip + limit
+        has_more = k < len(rows)
+        if 0 < k < len(rows):
+            kth_price = price[np.argpartition(price, k - 1)[k - 1]]
+            # Keep every row tied at the k-th price so the id tie-break stays exact
+            candidates = price <= kth_price
+            rows, price = rows[candidates], price[candidates]
+        rows = rows[np.lexsort((self.ids[rows], price))]
+        
+        page_rows = rows[skip:k]
+        return [self.records[row] for row in page_rows], has_more
@@ -0,0 +1,86 @@
+"""
+Token-bucket rate limiting for outbound API calls
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, fall back to per-process limiting
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenBucket:
+    """
+    Async-aware token bucket that only delays callers once the budget is exhausted.
+    
+    Each acquire() reserves a token immediately (the balance may go negative) and then
+    sleeps until that token would have been refilled, so waiting callers queue up in
+    order without holding any lock while they sleep.
+    
+    When state_path is given the bucket state lives in that file and is updated under
+    an exclusive flock, so every uvicorn worker on the host shares one budget.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, state_path: Optional[str] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.state_path = state_path
+        if state_path and fcntl is None:
+            logger.warning("File-backed rate limiting needs fcntl; limiting per process instead")
+            self.state_path = None
+        self._tokens = capacity
+        self._updated_at = time.time()
+        self._lock = asyncio.Lock()
+
+    def _reserve(self, tokens: float, updated_at: float) -> tuple:
+        """Refill the bucket up to now, take one token and return (tokens, now, wait)"""
+        now = time.time()
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+        tokens -= 1
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, now, wait
+
+    def _reserve_local(self) -> float:
+        self._tokens, self._updated_at, wait = self._reserve(self._tokens, self._updated_at)
+        return wait
+
+    def _reserve_shared(self) -> float:
+        fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.read(fd, 4096)
+            try:
+                state = json.loads(raw) if raw else {}
+            except ValueError:
+                state = {}
+            tokens, now, wait = self._reserve(
+                state.get("tokens", self.capacity),
+                state.get("updated_at", time.time())
+            )
+            payload = json.dumps({"tokens": tokens, "updated_at": now}).encode()
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, payload)
+            return wait
+        finally:
+            os.close(fd)  # Closing the descriptor releases the flock
+
+    async def acquire(self) -> float:
+        """
+        Wait until a request may be sent. Returns the number of seconds spent waiting.
+        """
+        async with self._lock:
+            if self.state_path:
+                wait = await asyncio.to_thread(self._reserve_shared)
+            else:
+                wait = self._reserve_local()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
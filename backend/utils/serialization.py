@@ -0,0 +1,60 @@
+"""
+Column-projection serialization for property results
+
+Routes select only the response fields, as plain SQL columns, and encode the row tuples
+straight to JSON bytes with orjson, skipping ORM instances, WKB decoding and Pydantic
+re-validation.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi.responses import ORJSONResponse
+from geoalchemy2 import Geometry
+from sqlalchemy import Float, cast, func
+
+from models.property import Property
+
+# Response fields that are not stored columns, computed in SQL instead of on the instance
+COMPUTED_FIELDS = {
+    "latitude": func.ST_Y(cast(Property.location, Geometry("POINT", srid=4326))),
+    "longitude": func.ST_X(cast(Property.location, Geometry("POINT", srid=4326))),
+    "average_rating": Property.rating_sum / func.nullif(Property.rating_count, 0, type_=Float),
+}
+
+
+def property_projection(fields: Iterable[str]) -> Tuple[Tuple[str, ...], List[Any]]:
+    """
+    (keys, columns) selecting the given response fields of Property in order
+
+    Build it once at import time; fields that are neither a column nor computable are
+    dropped.
+    """
+    table = Property.__table__
+    keys, columns = [], []
+    for field in fields:
+        if field in COMPUTED_FIELDS:
+            columns.append(COMPUTED_FIELDS[field].label(field))
+        elif field in table.c:
+            columns.append(table.c[field])
+        else:
+            continue
+        keys.append(field)
+    return tuple(keys), columns
+
+
+def rows_to_dicts(keys: Sequence[str], rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Pair row tuples with keys; trailing row values beyond the keys (e.g. sort keys used
+    for cursors) are ignored
+    """
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def rows_response(
+    keys: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    headers: Optional[Dict[str, str]] = None,
+) -> ORJSONResponse:
+    """
+    JSON array response encoded by orjson (datetimes and enums are handled natively)
+    """
+    return ORJSONResponse(rows_to_dicts(keys, rows), headers=headers)
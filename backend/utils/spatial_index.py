@@ -0,0 +1,115 @@
+"""
+In-memory grid index for radius and nearest-neighbour queries over lat/lon points
+"""
+import math
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Set, Tuple
+
+import numpy as np
+
+from utils.geo import EARTH_RADIUS_KM, bounding_box, haversine_km_many
+
+# Kilometers per degree of latitude
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+class GridIndex:
+    """
+    Points bucketed into cells of `cell_deg` x `cell_deg` degrees
+
+    Queries only compute distances for points in the cells overlapping the search
+    circle's bounding box. Keys are unique; inserting an existing key moves it.
+    """
+    
+    def __init__(self, cell_deg: float = 0.05):
+        self.cell_deg = cell_deg
+        self._lon_cells = max(1, round(360 / cell_deg))
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = defaultdict(set)
+        self._points: Dict[Hashable, Tuple[float, float, Tuple[int, int], Any]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._points)
+    
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (
+            math.floor(latitude / self.cell_deg),
+            math.floor((longitude + 180) / self.cell_deg) % self._lon_cells
+        )
+    
+    def insert(self, key: Hashable, latitude: float, longitude: float, item: Any = None) -> None:
+        """Add or move a point; `item` is returned with query results"""
+        self.remove(key)
+        cell = self._cell(latitude, longitude)
+        self._cells[cell].add(key)
+        self._points[key] = (latitude, longitude, cell, item)
+    
+    def remove(self, key: Hashable) -> None:
+        """Drop a point if present"""
+        entry = self._points.pop(key, None)
+        if entry is None:
+            return
+        cell = entry[2]
+        self._cells[cell].discard(key)
+        if not self._cells[cell]:
+            del self._cells[cell]
+    
+    def clear(self) -> None:
+        self._cells.clear()
+        self._points.clear()
+    
+    def _candidate_keys(self, latitude: float, longitude: float, radius_km: float) -> List[Hashable]:
+        """Keys in the cells covering the bounding box of the search circle"""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        min_row = math.floor(min_lat / self.cell_deg)
+        max_row = math.floor(max_lat / self.cell_deg)
+        
+        if max_lon - min_lon >= 360:
+            columns = range(self._lon_cells)
+        else:
+            first = math.floor((min_lon + 180) / self.cell_deg)
+            last = math.floor((max_lon + 180) / self.cell_deg)
+            columns = {column % self._lon_cells for column in range(first, last + 1)}
+        
+        keys = []
+        for row in range(min_row, max_row + 1):
+            for column in columns:
+                cell = self._cells.get((row, column))
+                if cell:
+                    keys.extend(cell)
+        return keys
+    
+    def query_radius(self, latitude: float, longitude: float, radius_km: float) -> List[Tuple[float, Hashable, Any]]:
+        """
+        (distance_km, key, item) for every point within radius_km, nearest first
+        """
+        keys = self._candidate_keys(latitude, longitude, radius_km)
+        if not keys:
+            return []
+        points = [self._points[key] for key in keys]
+        distances = haversine_km_many(
+            latitude, longitude,
+            [point[0] for point in points], [point[1] for point in points]
+        )
+        results = [
+            (float(distances[index]), keys[index], points[index][3])
+            for index in np.flatnonzero(distances <= radius_km)
+        ]
+        results.sort(key=lambda result: (result[0], result[1]))
+        return results
+    
+    def nearest(self, latitude: float, longitude: float, k: int) -> List[Tuple[float, Hashable, Any]]:
+        """
+        The k closest points, found by doubling the search radius from one cell
+
+        Every point closer than the searched radius is found, so once k points fall
+        inside it they are the exact k nearest.
+        """
+        if k <= 0 or not self._points:
+            return []
+        radius_km = self.cell_deg * KM_PER_DEGREE
+        max_radius_km = math.pi * EARTH_RADIUS_KM
+        while True:
+            results = self.query_radius(latitude, longitude, radius_km)
+            if len(results) >= k or radius_km >= max_radius_km:
+                return results[:k]
+            radius_km = min(radius_km * 2, max_radius_km)
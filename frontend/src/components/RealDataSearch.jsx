@@ -1,5 +1,4 @@
 import React, { useState, useEffect, useRef } from 'react';
-import axios from 'axios';
 import { MapContainer, TileLayer, Marker, Popup } from 'react-leaflet';
 import 'leaflet/dist/leaflet.css';
 import L from 'leaflet';
@@ -91,35 +90,65 @@ function RealDataSearch() {
     setLoading(true);
     setError(null);
     
+    setResults([]);
+    
     try {
-      const response = await axios.get(`/api/v1/osm/search`, {
-        params: {
-          query: location,
-          radius_km: radius,
-          accommodation_types: accommodationTypes
-        }
-      });
+      // Stream results so the first markers appear before the whole search finishes
+      const params = new URLSearchParams({ query: location, radius_km: radius, stream: 'true' });
+      accommodationTypes.forEach((type) => params.append('accommodation_types', type));
       
-      if (response.data.success) {
-        setResults(response.data.results);
-        
-        // Update map center
-        const searchLoc = response.data.location;
-        setSearchLocation(searchLoc);
-        setMapCenter([searchLoc.latitude, searchLoc.longitude]);
-        setMapZoom(13);
-        
-        if (response.data.results.length === 0) {
-          setError(`No accommodations found near ${location}. Try increasing the search radius or searching a different area.`);
+      const response = await fetch(`/api/v1/osm/search?${params.toString()}`);
+      if (!response.ok) {
+        throw new Error(`Search request failed with status ${response.status}`);
+      }
+      
+      // A location that cannot be geocoded comes back as a plain JSON body
+      if (!response.headers.get('content-type')?.includes('ndjson')) {
+        const data = await response.json();
+        setError(data.message || 'Search failed');
+        return;
+      }
+      
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let totalResults = 0;
+      
+      const handleEvent = (event) => {
+        if (event.type === 'location') {
+          const searchLoc = event.location;
+          setSearchLocation(searchLoc);
+          setMapCenter([searchLoc.latitude, searchLoc.longitude]);
+          setMapZoom(13);
+        } else if (event.type === 'results') {
+          totalResults += event.results.length;
+          setResults((prev) => [...prev, ...event.results]);
+        } else if (event.type === 'error') {
+          throw new Error(event.detail);
         }
-      } else {
-        setError(response.data.message || 'Search failed');
-        setResults([]);
+      };
+      
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter((line) => line.trim()).forEach((line) => handleEvent(JSON.parse(line)));
+      }
+      if (buffer.trim()) {
+        handleEvent(JSON.parse(buffer));
+      }
+      
+      if (totalResults === 0) {
+        setError(`No accommodations found near ${location}. Try increasing the search radius or searching a different area.`);
       }
     } catch (err) {
       console.error('Search error:', err);
-      setError('Error searching for accommodations. Please try again later.');
+      // Drop markers from batches that arrived before the stream failed; they are an incomplete set
       setResults([]);
+      setSelectedResult(null);
+      setError('Error searching for accommodations. Please try again later.');
     } finally {
       setLoading(false);
     }